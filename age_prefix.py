@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from cube import CUBE_DIMS
+
+# Bảng cộng dồn theo Age của cube chính xác: với mỗi tổ hợp Job Level × Entrepreneurship ×
+# Gender × Field_of_Study (mảng dày, ô cuối của mỗi chiều là NaN), Count, *_sum và *_sumsq
+# cộng dồn dọc trục Age đã sắp xếp. Khoảng tuổi [a, b] ứng với hai vị trí lo, hi trên trục
+# (searchsorted), tổng của cả khoảng = cum[hi] - cum[lo], giá trị từng tuổi = hiệu hai ô kề nhau:
+# không quét dòng dữ liệu hay ô cube nào, chi phí không phụ thuộc số dòng.
+#
+# slice_cube() và rollup() của cube.py nhận AgePrefix / AgeWindow thay cho cube (cho cùng kết
+# quả), nên percentage_by_age, mean_by, value_counts, age_density_by và các builder của
+# charts.py dùng được nguyên như cũ. First_Row (chỉ để giữ thứ tự xuất hiện) không trừ được
+# nên lấy min trên các tuổi của khoảng.
+_NO_ROW = np.iinfo(np.int64).max
+
+
+class AgePrefix:
+    def __init__(self, cube, dims=CUBE_DIMS):
+        self.dims = [d for d in dims if d != 'Age']
+        self.dtypes = {d: cube[d].dtype for d in self.dims}
+        self.ages = np.sort(cube['Age'].unique())
+        self.columns = [c for c in cube.columns if c == 'Count' or c.endswith(('_sum', '_sumsq'))]
+
+        # Mã category -1 (NaN) rơi vào ô cuối của chiều đó
+        shape = tuple(len(self.dtypes[d].categories) + 1 for d in self.dims) + (len(self.ages),)
+        cells = tuple(cube[d].cat.codes.to_numpy() for d in self.dims)
+        cells += (np.searchsorted(self.ages, cube['Age'].to_numpy()),)
+
+        self.cumsum = {}
+        for column in self.columns:
+            values = np.zeros(shape, dtype=np.int64)
+            values[cells] = cube[column].to_numpy()
+            self.cumsum[column] = np.concatenate(
+                [np.zeros(shape[:-1] + (1,), dtype=np.int64), values.cumsum(axis=-1)], axis=-1
+            )
+        self.first_row = np.full(shape, _NO_ROW, dtype=np.int64)
+        self.first_row[cells] = cube['First_Row'].to_numpy()
+
+    def window(self):
+        masks = [np.ones(len(self.dtypes[d].categories) + 1, dtype=bool) for d in self.dims]
+        return AgeWindow(self, masks, 0, len(self.ages))
+
+    def slice(self, **filters):
+        return self.window().slice(**filters)
+
+
+# Một slice của AgePrefix: các giá trị được chọn của mỗi chiều và khoảng [lo, hi) trên trục Age
+class AgeWindow:
+    def __init__(self, prefix, masks, lo, hi):
+        self.prefix = prefix
+        self.masks = masks
+        self.lo = lo
+        self.hi = max(lo, hi)
+
+    # Cùng ngữ nghĩa với cube.slice_cube: None = không lọc, list rỗng = không lấy gì
+    def slice(self, level=None, age_range=None, statuses=None, genders=None, fields=None):
+        selected = {'Current_Job_Level': None if level is None else [level], 'Entrepreneurship': statuses,
+                    'Gender': genders, 'Field_of_Study': fields}
+        masks = list(self.masks)
+        for i, dim in enumerate(self.prefix.dims):
+            if selected.get(dim) is not None:
+                categories = self.prefix.dtypes[dim].categories
+                keep = np.zeros_like(masks[i])
+                keep[[categories.get_loc(v) for v in selected[dim] if v in categories]] = True
+                masks[i] = masks[i] & keep
+        lo, hi = self.lo, self.hi
+        if age_range is not None:
+            lo = max(lo, int(np.searchsorted(self.prefix.ages, age_range[0], side='left')))
+            hi = min(hi, int(np.searchsorted(self.prefix.ages, age_range[1], side='right')))
+        return AgeWindow(self.prefix, masks, lo, hi)
+
+    # Chọn các giá trị của từng chiều; chiều thuộc `by` bỏ ô NaN (groupby bỏ nhóm NaN)
+    def _select(self, values, by):
+        codes = []
+        for i, dim in enumerate(self.prefix.dims):
+            mask = self.masks[i].copy()
+            if dim in by:
+                mask[-1] = False
+            values = values.compress(mask, axis=i)
+            codes.append(np.flatnonzero(mask))
+        return values, codes
+
+    # Cộng các chiều không thuộc `by`, rồi đưa các chiều còn lại về thứ tự của `by`
+    def _reduce(self, values, by, reduce):
+        group_dims = [d for d in by if d != 'Age']
+        other_axes = tuple(i for i, d in enumerate(self.prefix.dims) if d not in group_dims)
+        values = reduce(values, axis=other_axes)
+        axes = [d for d in self.prefix.dims if d in group_dims] + ['Age']
+        return values.transpose([axes.index(d) for d in by])
+
+    @property
+    def empty(self):
+        return self._totals('Count', []).sum() == 0
+
+    def _totals(self, column, by):
+        cumsum, _ = self._select(self.prefix.cumsum[column], by)
+        if 'Age' in by:
+            values = cumsum[..., self.lo + 1:self.hi + 1] - cumsum[..., self.lo:self.hi]
+        else:
+            values = cumsum[..., self.hi] - cumsum[..., self.lo]
+        return self._reduce(values, by, np.sum)
+
+    # Như cube.rollup(slice, by) trên các ô của slice: cùng cột, cùng kiểu, cùng thứ tự dòng
+    def rollup(self, by):
+        totals = {column: self._totals(column, by) for column in self.prefix.columns}
+        first_row, codes = self._select(self.prefix.first_row[..., self.lo:self.hi], by)
+        if 'Age' not in by:
+            first_row = first_row.min(axis=-1, initial=_NO_ROW)
+        first_row = self._reduce(first_row, by, lambda v, axis: v.min(axis=axis, initial=_NO_ROW))
+
+        # observed=True: chỉ các nhóm có ít nhất một dòng, theo thứ tự của groupby (sort=True)
+        positions = np.nonzero(totals['Count'] > 0)
+        columns = {}
+        for k, dim in enumerate(by):
+            if dim == 'Age':
+                columns[dim] = self.prefix.ages[self.lo:self.hi][positions[k]]
+            else:
+                dim_codes = codes[self.prefix.dims.index(dim)]
+                columns[dim] = pd.Categorical.from_codes(dim_codes[positions[k]], dtype=self.prefix.dtypes[dim])
+        columns.update({column: values[positions] for column, values in totals.items()})
+        columns['First_Row'] = first_row[positions]
+        return pd.DataFrame(columns)
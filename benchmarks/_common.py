@@ -0,0 +1,20 @@
+# Dùng chung cho các benchmark: đưa thư mục gốc của repo vào sys.path (để import các module
+# của app khi chạy python benchmarks/bench_*.py) và đo thời gian trung vị.
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+# Trung vị thời gian (ms) của `repeat` lần gọi fn()
+def median_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
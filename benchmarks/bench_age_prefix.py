@@ -0,0 +1,91 @@
+# Một khoảng tuổi của thanh trượt Age: quét frame (Age.between + groupby), cắt các ô của cube
+# (slice_cube + rollup), và hiệu hai tổng cộng dồn của AgePrefix (age_prefix.py). Với các khoảng
+# tuổi ngẫu nhiên, kiểm tra AgePrefix cho đúng kết quả của cube cho mọi bảng các trang dùng
+# (% theo tuổi, Job_Offers / Work_Life_Balance trung bình theo tuổi, đếm theo Gender /
+# Field_of_Study, mật độ tuổi) rồi đo thời gian của cả bộ các bảng đó.
+#
+#   python benchmarks/bench_age_prefix.py --rows 100000 1000000
+import argparse
+import random
+
+import numpy as np
+import pandas as pd
+
+from _common import median_time
+from age_prefix import AgePrefix
+from cube import build_cube, mean_by, percentage_by_age, slice_cube, value_counts
+from density import age_density_by
+from generate_data import generate
+
+
+# Các bảng graphtab.py, stackedbarchart.py, line.py và donut.py cần cho một khoảng tuổi
+def cube_tables(source, level, age_range):
+    cube_level = slice_cube(source, level=level, age_range=age_range)
+    grid = np.linspace(age_range[0], age_range[1], 100)
+    return [
+        percentage_by_age(cube_level),
+        mean_by(cube_level, ['Age', 'Entrepreneurship'], 'Job_Offers'),
+        mean_by(slice_cube(source, age_range=age_range), ['Current_Job_Level', 'Age'], 'Work_Life_Balance'),
+        value_counts(cube_level, 'Gender'),
+        value_counts(cube_level, 'Field_of_Study'),
+        age_density_by(cube_level, 'Gender', grid),
+    ]
+
+
+# Cùng các bảng (trừ mật độ) tính thẳng trên frame, như trước khi có cube
+def frame_tables(df, level, age_range):
+    in_window = df['Age'].between(age_range[0], age_range[1])
+    rows = df[in_window & (df['Current_Job_Level'] == level)]
+    counts = rows.groupby(['Age', 'Entrepreneurship'], observed=True).size()
+    return [
+        counts / counts.groupby(level='Age').transform('sum'),
+        rows.groupby(['Age', 'Entrepreneurship'], observed=True)['Job_Offers'].mean(),
+        df[in_window].groupby(['Current_Job_Level', 'Age'], observed=True)['Work_Life_Balance'].mean(),
+        rows['Gender'].value_counts(),
+        rows['Field_of_Study'].value_counts(),
+    ]
+
+
+def same_tables(a, b):
+    for x, y in zip(a[:-1], b[:-1]):
+        pd.testing.assert_frame_equal(x, y)
+    return ([c for c, _ in a[-1]] == [c for c, _ in b[-1]]
+            and all(np.array_equal(u, v) for (_, u), (_, v) in zip(a[-1], b[-1])))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--windows", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'frame (ms)':>11} {'cube (ms)':>10} {'prefix (ms)':>12} {'vs cube':>8}")
+    for n_rows in args.rows:
+        df = pd.concat(generate(n_rows, seed=0), ignore_index=True)
+        cube = build_cube(df)
+        prefix = AgePrefix(cube)
+
+        rng = random.Random(0)
+        ages = sorted(cube['Age'].unique())
+        levels = list(cube['Current_Job_Level'].cat.categories)
+        windows = []
+        for _ in range(args.windows):
+            low = rng.choice(ages)
+            windows.append((rng.choice(levels), (int(low), int(rng.choice([a for a in ages if a >= low])))))
+
+        for level, age_range in windows:
+            if not same_tables(cube_tables(cube, level, age_range), cube_tables(prefix, level, age_range)):
+                raise SystemExit(f"{level} {age_range}: AgePrefix differs from the cube")
+
+        def run(tables, source):
+            return lambda: [tables(source, level, age_range) for level, age_range in windows]
+
+        t_frame = median_time(run(frame_tables, df), args.repeat) / len(windows)
+        t_cube = median_time(run(cube_tables, cube), args.repeat) / len(windows)
+        t_prefix = median_time(run(cube_tables, prefix), args.repeat) / len(windows)
+        print(f"{n_rows:>10,} {t_frame:>11.2f} {t_cube:>10.2f} {t_prefix:>12.2f} {t_cube / t_prefix:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
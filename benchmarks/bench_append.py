@@ -0,0 +1,45 @@
+# Nối thêm một delta vào dữ liệu đã nạp: cập nhật cube (thanh % chồng, đường Job_Offers,
+# đường Work_Life_Balance) bằng cube.append_rows so với tính lại build_cube trên cả dữ liệu.
+# Thời gian append_rows theo kích thước delta, tính lại theo tổng số dòng.
+#
+#   python benchmarks/bench_append.py --rows 1000000 --delta 1000 10000 100000
+import argparse
+
+import pandas as pd
+
+from _common import median_time
+from cube import CUBE_DIMS, CUBE_MEASURES, PROMOTION_DIMS, PROMOTION_MEASURES, append_rows, build_cube
+from generate_data import generate, generate_chunk
+
+CUBES = {
+    "cube": (CUBE_DIMS, CUBE_MEASURES),
+    "promotion_cube": (PROMOTION_DIMS, PROMOTION_MEASURES),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--delta", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.concat(generate(args.rows, seed=0), ignore_index=True)
+    cubes = {name: build_cube(df, dims, measures) for name, (dims, measures) in CUBES.items()}
+
+    print(f"{'rows':>10} {'delta':>8} {'cube':>15} {'rebuild (ms)':>13} {'append (ms)':>12} {'speedup':>8}")
+    for n_delta in args.delta:
+        delta = generate_chunk(1, 0, args.rows, n_delta, id_width=len(str(args.rows + n_delta)))
+        full = pd.concat([df, delta], ignore_index=True)
+        for name, (dims, measures) in CUBES.items():
+            merged = append_rows(cubes[name], delta, dims, measures)
+            pd.testing.assert_frame_equal(merged, build_cube(full, dims, measures))
+
+            t_full = median_time(lambda: build_cube(full, dims, measures), args.repeat)
+            t_append = median_time(lambda: append_rows(cubes[name], delta, dims, measures), args.repeat)
+            print(f"{args.rows:>10} {n_delta:>8} {name:>15} {t_full:>13.1f} {t_append:>12.1f} {t_full / t_append:>7.0f}x")
+        del full
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Chế độ xem trước: thời gian dựng cube mẫu (sample.py) so với cube chính xác, và tỉ lệ điểm của
+# biểu đồ % / Job_Offers trung bình (mọi Job Level) có kết quả chính xác nằm trong khoảng tin cậy.
+#
+#   python benchmarks/bench_approx.py --rows 5000000
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import _common  # noqa: F401 (đưa thư mục gốc vào sys.path)
+from cube import build_cube, mean_by, percentage_by_age, slice_cube
+from generate_data import generate
+from sample import PER_STRATUM, build_sample_cube, mean_by_ci, percentage_by_age_ci, stratified_sample
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def coverage(exact, approx, column, keys):
+    merged = exact.merge(approx, on=keys, suffixes=("", "_approx"))
+    inside = (merged[column] - merged[f"{column}_approx"]).abs() <= merged["CI"]
+    return inside.mean(), merged["CI"].median()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--per-stratum", type=int, default=PER_STRATUM)
+    args = parser.parse_args()
+
+    df = pd.concat(generate(args.rows, seed=0), ignore_index=True)
+    cube, t_exact = timed(lambda: build_cube(df))
+    sample_cube, t_sample = timed(lambda: build_sample_cube(stratified_sample(df, per_stratum=args.per_stratum)))
+    print(f"{args.rows:,} rows: exact cube {t_exact:.0f} ms, sample cube {t_sample:.0f} ms "
+          f"({t_exact / t_sample:.1f}x), {int(sample_cube['Sample_Count'].sum()):,} sampled rows")
+
+    keys = ["Age", "Entrepreneurship"]
+    pct, offers = [], []
+    for level in df["Current_Job_Level"].cat.categories:
+        exact, approx = slice_cube(cube, level=level), slice_cube(sample_cube, level=level)
+        pct.append(coverage(percentage_by_age(exact), percentage_by_age_ci(approx), "Percentage", keys))
+        offers.append(coverage(mean_by(exact, keys), mean_by_ci(approx, keys), "Job_Offers", keys))
+    for name, result in [("percentage", pct), ("avg Job_Offers", offers)]:
+        covered, width = np.mean([r[0] for r in result]), np.median([r[1] for r in result])
+        print(f"{name:>15}: {covered:.0%} of points inside the 95% CI, median half-width {width:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# So sánh đường pandas (nạp cả frame rồi lọc/groupby) với sql_backend (DuckDB truy vấn thẳng
+# Parquet): cube của graphtab/stackedbarchart, và hai trung bình theo nhóm kiểu line.py /
+# linechart.py viết thẳng bằng SQL (app chỉ dùng SqlBackend.cube). Dữ liệu được tạo bằng
+# generate_data.py.
+#
+#   python benchmarks/bench_backend.py --rows 1000000 5000000
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from _common import median_time
+from cube import build_cube
+from generate_data import write
+from sql_backend import SqlBackend
+
+AGE_RANGE = (20, 25)
+
+
+# Như df[df.Age.between(*age_range)].groupby(by)[measure].mean(), chạy trong DuckDB
+def sql_mean_by(backend, by, measure, age_range=None):
+    keys = ", ".join(f'"{c}"' for c in by)
+    where = ' WHERE "Age" BETWEEN ? AND ?' if age_range else ""
+    return backend.query(
+        f'SELECT {keys}, avg("{measure}") AS "{measure}" FROM data{where} GROUP BY {keys} ORDER BY {keys}',
+        age_range or (),
+    )
+
+
+def pandas_queries(df):
+    return {
+        "cube": lambda: build_cube(df),
+        "line": lambda: (
+            df[df["Age"].between(*AGE_RANGE)]
+            .groupby(["Current_Job_Level", "Age"])["Work_Life_Balance"].mean().reset_index()
+        ),
+        "linechart": lambda: (
+            df.groupby(["Current_Job_Level", "Years_to_Promotion"])["Work_Life_Balance"].mean().reset_index()
+        ),
+    }
+
+
+def sql_queries(backend):
+    return {
+        "cube": lambda: backend.cube(),
+        "line": lambda: sql_mean_by(backend, ["Current_Job_Level", "Age"], "Work_Life_Balance", AGE_RANGE),
+        "linechart": lambda: sql_mean_by(backend, ["Current_Job_Level", "Years_to_Promotion"], "Work_Life_Balance"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'query':>10} {'pandas (ms)':>12} {'duckdb (ms)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.rows:
+            path = os.path.join(workdir, f"data_{n_rows}.parquet")
+            write(path, n_rows, seed=0)
+
+            # Khởi động: pandas phải nạp cả frame, DuckDB chỉ mở file
+            load = median_time(lambda: pd.read_parquet(path), 1)
+            start = median_time(lambda: SqlBackend(path), 1)
+            print(f"{n_rows:>10} {'load':>10} {load:>12.1f} {start:>12.1f} {load / start:>7.0f}x")
+
+            df = pd.read_parquet(path)
+            backend = SqlBackend(path)
+            sql = sql_queries(backend)
+            for name, fn in pandas_queries(df).items():
+                t_pandas = median_time(fn, args.repeat)
+                t_sql = median_time(sql[name], args.repeat)
+                print(f"{n_rows:>10} {name:>10} {t_pandas:>12.1f} {t_sql:>12.1f} {t_pandas / t_sql:>7.1f}x")
+            del df, backend
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# So sánh st.cache_data (mỗi lần hit là một bản copy unpickle) với st.cache_resource
+# (mọi session dùng chung một object): độ trễ cache hit và bộ nhớ thêm cho mỗi session.
+#
+#   python benchmarks/bench_cache.py --sessions 20
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+import streamlit as st
+
+from _common import ROOT
+os.chdir(ROOT)
+from data_cache import load_columnar  # noqa: E402
+from dataset import DATA_FILE, load_data  # noqa: E402
+
+
+@st.cache_data
+def load_data_copy():
+    return load_columnar(DATA_FILE)
+
+
+def measure(loader, sessions):
+    loader()  # miss: nạp vào cache
+    frames, latencies = [], []
+    tracemalloc.start()
+    for _ in range(sessions):
+        start = time.perf_counter()
+        frames.append(loader())  # mỗi session giữ frame của riêng nó
+        latencies.append(time.perf_counter() - start)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(latencies) * 1000, held / sessions / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'loader':>18} {'hit p50 (ms)':>13} {'MiB/session':>12}")
+    for name, loader in [("st.cache_data", load_data_copy), ("st.cache_resource", load_data)]:
+        latency, mib = measure(loader, args.sessions)
+        print(f"{name:>18} {latency:>13.3f} {mib:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Bộ nhớ và tốc độ của frame theo dataset.SCHEMA (category, int8/int16/int32, float32) so
+# với kiểu cũ (chuỗi, int64, float64) trên dữ liệu tạo bằng generate_data.py.
+#
+#   python benchmarks/bench_dtypes.py --rows 1000000
+import argparse
+
+import pandas as pd
+
+from _common import median_time
+from cube import build_cube
+from dataset import SCHEMA
+from filter_index import FilterIndex
+from generate_data import generate
+
+
+def legacy_type(dtype):
+    if dtype is str or isinstance(dtype, pd.CategoricalDtype):
+        return str
+    return "float64" if pd.api.types.is_float_dtype(dtype) else "int64"
+
+
+LEGACY_SCHEMA = {column: legacy_type(dtype) for column, dtype in SCHEMA.items()}
+
+OPERATIONS = {
+    "groupby level x age": lambda df: (
+        df.groupby(["Current_Job_Level", "Age"], observed=True)["Work_Life_Balance"].mean()
+    ),
+    "groupby 5 dims (cube)": lambda df: build_cube(df),
+    "isin Field_of_Study": lambda df: df["Field_of_Study"].isin(["Law", "Medicine", "Arts"]),
+    "== Gender": lambda df: df["Gender"] == "Male",
+    "between Age": lambda df: df["Age"].between(20, 25),
+    "FilterIndex": lambda df: FilterIndex(df),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compact = pd.concat(generate(args.rows, seed=0), ignore_index=True)
+    legacy = compact.astype(LEGACY_SCHEMA)
+
+    old_mb = legacy.memory_usage(deep=True).sum() / 2**20
+    new_mb = compact.memory_usage(deep=True).sum() / 2**20
+    print(f"{args.rows:,} rows: {old_mb:.1f} MiB -> {new_mb:.1f} MiB ({old_mb / new_mb:.1f}x smaller)")
+    without_id = [c for c in SCHEMA if c != "Student_ID"]
+    old_mb = legacy[without_id].memory_usage(deep=True).sum() / 2**20
+    new_mb = compact[without_id].memory_usage(deep=True).sum() / 2**20
+    print(f"{'':>{len(f'{args.rows:,} rows')}}  without Student_ID: {old_mb:.1f} MiB -> {new_mb:.1f} MiB "
+          f"({old_mb / new_mb:.1f}x smaller)")
+
+    print(f"\n{'operation':>24} {'old (ms)':>9} {'new (ms)':>9} {'speedup':>8}")
+    for name, fn in OPERATIONS.items():
+        t_old = median_time(lambda: fn(legacy), args.repeat)
+        t_new = median_time(lambda: fn(compact), args.repeat)
+        print(f"{name:>24} {t_old:>9.1f} {t_new:>9.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# Figure ghép từ dict (figure_spec.py, charts.py) so với cách dựng cũ bằng plotly.express /
+# go.Figure (validator chạy ở mỗi add_trace, update_layout, update_traces). Với mọi tổ hợp bộ
+# lọc mà warmup.py làm nóng (cube chính xác và cube mẫu của chế độ xem trước, thêm vài khoảng
+# tuổi hẹp/rỗng), kiểm tra JSON của hai cách giống hệt nhau rồi đo thời gian dựng + to_json.
+#
+#   python benchmarks/bench_figures.py --rows 1000000
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from _common import median_time
+import charts
+from charts import COLOR_MAP, selected_statuses
+from cube import build_cube, mean_by, percentage_by_age, slice_cube, value_counts
+from density import age_density_by
+from generate_data import generate
+from sample import build_sample_cube, mean_by_ci, percentage_by_age_ci, stratified_sample
+from warmup import states
+
+
+# ---- cách dựng cũ (plotly.express / go.Figure có validator) ----
+
+def old_graphtab_bar(cube_level, level, statuses, preview=False):
+    statuses = selected_statuses(statuses)
+    df_grouped = percentage_by_age_ci(cube_level) if preview else percentage_by_age(cube_level)
+    df_bar = df_grouped[df_grouped['Entrepreneurship'].isin(statuses)]
+    even_ages = [age for age in sorted(df_bar['Age'].unique()) if age % 2 == 0]
+    fig = px.bar(
+        df_bar, x='Age', y='Percentage', color='Entrepreneurship', barmode='stack',
+        color_discrete_map=COLOR_MAP, category_orders={'Entrepreneurship': ['No', 'Yes']},
+        labels={'Age': 'Age', 'Percentage': 'Percentage'}, error_y='CI' if preview else None,
+        height=450, width=1250, title=f"Entrepreneurship Distribution by Age – {level} Level"
+    )
+    fig.for_each_trace(lambda trace: trace.update(
+        hovertemplate=f"Entrepreneurship={trace.name}<br>Age=%{{x}}<br>Percentage=%{{y:.0%}}<extra></extra>",
+        hoverinfo="skip"
+    ))
+    fig.update_layout(
+        margin=dict(t=40, l=40, r=40, b=40), legend_title_text='Entrepreneurship', xaxis_tickangle=0,
+        bargap=0.1, xaxis=dict(tickvals=even_ages),
+        yaxis=dict(title="Percentage", range=[0, 1], tickformat=".0%"),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
+    )
+    return fig
+
+
+def old_line(df_avg_offers, statuses, preview, fig):
+    for status in statuses:
+        data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
+        fig.add_trace(go.Scatter(
+            x=data_status["Age"], y=data_status["Job_Offers"], mode="lines+markers", name=status,
+            line=dict(color=COLOR_MAP[status], width=2), marker=dict(size=6),
+            error_y=dict(type='data', array=data_status['CI']) if preview else None,
+            hovertemplate="%{y:.2f}"
+        ))
+    return fig
+
+
+def old_graphtab_line(cube_filtered, statuses, preview=False):
+    mean = mean_by_ci if preview else mean_by
+    df_avg_offers = mean(cube_filtered, ['Age', 'Entrepreneurship'], 'Job_Offers')
+    even_ages = [age for age in sorted(df_avg_offers['Age'].unique()) if age % 2 == 0]
+    fig = old_line(df_avg_offers, selected_statuses(statuses), preview, go.Figure())
+    spikes = dict(showspikes=True, spikemode='across', spikesnap='cursor', spikethickness=1.2, spikedash='dot')
+    fig.update_layout(
+        margin=dict(t=40, l=40, r=40, b=40), legend_title_text='Entrepreneurship', xaxis_tickangle=0,
+        hovermode="x unified", width=1250, xaxis=dict(tickvals=even_ages, **spikes),
+        yaxis=dict(title="Average Job Offers", **spikes),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
+    )
+    return fig
+
+
+def old_graphtab_density(cube_filtered, option, age_range):
+    group_col = 'Gender' if option == 'Gender' else 'Field_of_Study'
+    fig = go.Figure()
+    x_vals = np.linspace(age_range[0], age_range[1], 100)
+    for cat, y_vals in age_density_by(cube_filtered, group_col, x_vals):
+        fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode='lines', name=str(cat), fill='tozeroy'))
+    fig.update_layout(
+        title=f"Age Distribution by {group_col.replace('_', ' ')}", xaxis_title="Age", yaxis_title="Density",
+        height=500, margin=dict(t=40, l=40, r=40, b=80),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5)
+    )
+    return fig
+
+
+def old_graphtab_donut(cube_filtered, option):
+    group_col = 'Gender' if option == 'Gender' else 'Field_of_Study'
+    counts = value_counts(cube_filtered, group_col)
+    fig = go.Figure(data=[go.Pie(labels=counts[group_col], values=counts['Count'], hole=0.5)])
+    fig.update_layout(title=f"{option} Distribution (Donut Chart)", height=350,
+                      margin=dict(t=40, l=40, r=40, b=40), showlegend=True)
+    return fig
+
+
+def old_stacked_bar(cube_level, level, statuses, preview=False):
+    df_bar = percentage_by_age_ci(cube_level) if preview else percentage_by_age(cube_level)
+    if statuses is not None:
+        df_bar = df_bar[df_bar['Entrepreneurship'].isin(statuses)]
+    fig = px.bar(
+        df_bar, x='Age', y='Percentage', color='Entrepreneurship', barmode='stack',
+        color_discrete_map=COLOR_MAP,
+        category_orders={'Entrepreneurship': ['No', 'Yes'], 'Age': sorted(df_bar['Age'].unique())},
+        labels={'Age': 'Age', 'Percentage': 'Percentage'}, error_y='CI' if preview else None,
+        height=400, title=f"Entrepreneurship Distribution by Age – {level} Level"
+    )
+    fig.update_layout(margin=dict(t=40, l=40, r=40, b=40), legend_title_text='Entrepreneurship',
+                      xaxis_tickangle=90, bargap=0.1)
+    fig.update_yaxes(tickformat=".0%", title="Percentage")
+    fig.update_layout(height=450)
+    return fig
+
+
+def old_stacked_line(cube_level, level, statuses, preview=False):
+    statuses = selected_statuses(statuses)
+    cube_status = slice_cube(cube_level, statuses=statuses)
+    mean = mean_by_ci if preview else mean_by
+    fig = old_line(mean(cube_status, ['Age', 'Entrepreneurship'], 'Job_Offers'), statuses, preview, go.Figure())
+    fig.update_layout(
+        title=f"Average Job Offers by Age – {level} Level", xaxis_title="Age", yaxis_title="Average Job Offers",
+        height=400, margin=dict(t=40, l=40, r=40, b=40), legend_title_text='Entrepreneurship',
+        xaxis_tickangle=90, hovermode="x unified",
+        xaxis=dict(showspikes=True, spikemode='across', spikesnap='cursor', spikethickness=1.2,
+                   spikedash='dot', spikecolor='gray')
+    )
+    fig.update_layout(height=300)
+    fig.update_yaxes(title="Average Job Offers")
+    return fig
+
+
+OLD = {
+    'bar': old_graphtab_bar, 'line': old_graphtab_line, 'density': old_graphtab_density,
+    'donut': old_graphtab_donut, 'stacked_bar': old_stacked_bar, 'stacked_line': old_stacked_line,
+}
+NEW = {
+    'bar': charts.graphtab_bar, 'line': charts.graphtab_line, 'density': charts.graphtab_density,
+    'donut': charts.graphtab_donut, 'stacked_bar': charts.stacked_bar, 'stacked_line': charts.stacked_line,
+}
+
+
+# Đối số của builder cho một trạng thái bộ lọc, như charts.graphtab_figure / stacked_figure
+def builder_args(cube, chart, state, preview):
+    genders, level, age_range, statuses = state['genders'], state['level'], state['age_range'], state['statuses']
+    cube_level, cube_filtered = charts.graphtab_slices(cube, genders, level, age_range, statuses)
+    if chart in ('bar', 'stacked_bar', 'stacked_line'):
+        return (cube_level, level, statuses, preview)
+    if chart == 'line':
+        return (cube_filtered, statuses, preview)
+    if chart == 'density':
+        return (cube_filtered, state['option'], age_range) if not cube_filtered.empty else None
+    return (cube_filtered, state['option']) if not cube_filtered.empty else None
+
+
+def cases(cube, sample_cube):
+    all_states = states(cube)
+    # Thêm khoảng tuổi hẹp và khoảng tuổi không có dòng nào
+    extra = [(chart, dict(state, age_range=age_range)) for chart, state in all_states[:60]
+             for age_range in [(25, 26), (80, 90)]]
+    for chart, state in all_states + extra:
+        for cube_, preview in [(cube, False), (sample_cube, True)]:
+            args = builder_args(cube_, chart, state, preview)
+            if args is not None:
+                yield chart, args
+
+
+def spec(fig):
+    return json.loads(fig.to_json())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.concat(generate(args.rows, seed=0), ignore_index=True)
+    cube, sample_cube = build_cube(df), build_sample_cube(stratified_sample(df))
+    all_cases = list(cases(cube, sample_cube))
+
+    by_chart = {}
+    for chart, builder_args_ in all_cases:
+        if spec(OLD[chart](*builder_args_)) != spec(NEW[chart](*builder_args_)):
+            raise SystemExit(f"{chart}: JSON differs for {builder_args_[1:]}")
+        by_chart.setdefault(chart, builder_args_)
+    print(f"{len(all_cases)} figures: identical JSON\n")
+
+    print(f"{'chart':>13} {'old (ms)':>9} {'new (ms)':>9} {'speedup':>8}")
+    for chart, builder_args_ in by_chart.items():
+        t_old = median_time(lambda: OLD[chart](*builder_args_).to_json(), args.repeat)
+        t_new = median_time(lambda: NEW[chart](*builder_args_).to_json(), args.repeat)
+        print(f"{chart:>13} {t_old:>9.1f} {t_new:>9.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Thời gian tiết kiệm được nhờ fragment: khi đổi "Select Variable for Visualization" ở tab
+# Demographics, trước đây cả trang chạy lại (mọi biểu đồ của cả hai tab), nay chỉ fragment
+# demographics_tab chạy lại. AppTest luôn chạy cả script nên ở mỗi lần đổi ta đo cả lần rerun
+# (chi phí cũ) và phần thời gian nằm trong fragment (chi phí mới, perf 'fragment:<tên>').
+# Trước mỗi lần đổi, khoảng tuổi được đổi sang giá trị mới để biểu đồ không lấy từ cache.
+#
+#   python benchmarks/bench_fragments.py --rounds 10
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from _common import ROOT
+os.chdir(ROOT)
+import perf  # noqa: E402
+
+PAGES = {"graphtab.py": "demographics_tab", "draftcuaple.py": "demographics_tab"}
+
+
+def _find(widgets, label):
+    for w in widgets:
+        if label in w.label:
+            return w
+    return None
+
+
+def bench_page(page, fragment, rounds):
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=300).run()
+    full, part = [], []
+    for i in range(rounds):
+        slider = _find(at.sidebar.slider, "Age")
+        slider.set_value((slider.min + i % 5, slider.max - i % 4)).run()
+
+        option = _find(at.selectbox, "Select Variable")
+        option.set_value("Field of Study" if option.value == "Gender" else "Gender")
+        perf.reset()
+        start = time.perf_counter()
+        at.run()
+        full.append((time.perf_counter() - start) * 1000)
+        part.append(perf.totals().get(f"fragment:{fragment}", 0.0) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{at.exception[0].value}")
+    return statistics.median(full), statistics.median(part)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    perf.enable()
+    print(f"{'page':>16} {'full rerun p50 (ms)':>20} {'fragment p50 (ms)':>18} {'saved (ms)':>11}")
+    for page, fragment in PAGES.items():
+        full, part = bench_page(page, fragment, args.rounds)
+        print(f"{page:>16} {full:>20.1f} {part:>18.1f} {full - part:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
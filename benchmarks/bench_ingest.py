@@ -0,0 +1,59 @@
+# Bộ nhớ đỉnh (RSS) và thời gian khi đọc xlsx: pd.read_excel so với data_cache.read_xlsx
+# (openpyxl read-only, chuyển từng chunk thành mảng đúng kiểu). Mỗi cách đọc chạy trong
+# một process riêng để RSS đỉnh không lẫn vào nhau. File xlsx được tạo bằng generate_data.py.
+#
+#   python benchmarks/bench_ingest.py --rows 100000 500000
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from _common import ROOT
+from generate_data import write
+
+# Chạy trong process con: RSS trước khi đọc (sau khi import), RSS đỉnh, thời gian, bộ nhớ frame
+MEASURE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from data_cache import read_xlsx
+from dataset import SCHEMA
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if {reader!r} == "read_excel":
+    df = pd.read_excel({path!r}).astype(SCHEMA)
+else:
+    df = read_xlsx({path!r}, dtype=SCHEMA)
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": seconds, "peak_mib": (peak - before) / 1024,
+                  "frame_mib": df.memory_usage(deep=True).sum() / 2**20}}))
+"""
+
+
+def measure(reader, path):
+    code = MEASURE.format(root=ROOT, reader=reader, path=path)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'reader':>11} {'time (s)':>9} {'peak +MiB':>10} {'frame MiB':>10} {'peak/frame':>11}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.rows:
+            path = os.path.join(workdir, f"data_{n_rows}.xlsx")
+            write(path, n_rows, seed=0)
+            for reader in ["read_excel", "read_xlsx"]:
+                r = measure(reader, path)
+                print(f"{n_rows:>8} {reader:>11} {r['seconds']:>9.2f} {r['peak_mib']:>10.1f} "
+                      f"{r['frame_mib']:>10.1f} {r['peak_mib'] / r['frame_mib']:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Nhãn % trên biểu đồ cột chồng của sunburst.py: một annotation cho mỗi cột (iterrows +
+# add_annotation, cách cũ) so với một trace text dựng từ cả frame (charts.sunburst_bar), theo số
+# nhóm tuổi. Kiểm tra hai cách cho cùng vị trí và cùng chữ cho mọi nhãn. Cách cũ chậm dần theo
+# bình phương số nhãn nên chỉ đo tới --old-max nhóm.
+#
+#   python benchmarks/bench_labels.py --buckets 12 50 200 1000
+import argparse
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from _common import median_time
+from charts import COLOR_MAP, sunburst_bar
+
+
+# Frame như `filtered` của sunburst.py: Age, Entrepreneurship, Count, Percentage
+def grouped_frame(n_buckets, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Age': np.repeat(np.arange(n_buckets, dtype='int16') + 18, 2),
+        'Entrepreneurship': pd.Categorical(['No', 'Yes'] * n_buckets, categories=['No', 'Yes']),
+        'Count': rng.integers(0, 50, 2 * n_buckets),
+    })
+    df['Percentage'] = df['Count'] / df.groupby('Age')['Count'].transform('sum').clip(lower=1)
+    return df
+
+
+def font_size_by_count(n):
+    return {1: 20, 2: 18, 3: 16, 4: 14, 5: 12, 6: 11, 7: 10, 8: 9, 9: 8, 10: 7}.get(n, 6)
+
+
+def old_bar(filtered, level, ages, font_size, width):
+    fig = px.bar(
+        filtered, x='Age', y='Percentage', color='Entrepreneurship', barmode='stack',
+        color_discrete_map=COLOR_MAP, category_orders={'Entrepreneurship': ['No', 'Yes'], 'Age': ages},
+        labels={'Age': 'Age', 'Percentage': 'Percentage'}, height=400, width=width,
+        title=f"{level} Level – Entrepreneurship by Age (%)"
+    )
+    for status in ['No', 'Yes']:
+        for _, row in filtered[filtered['Entrepreneurship'] == status].iterrows():
+            if row['Percentage'] > 0:
+                fig.add_annotation(
+                    x=row['Age'], y=0.2 if status == 'No' else 0.9, text=f"{row['Percentage']:.0%}",
+                    showarrow=False, font=dict(color="white", size=font_size), xanchor="center", yanchor="middle"
+                )
+    fig.update_layout(margin=dict(t=40, l=40, r=40, b=40), legend_title_text='Entrepreneurship',
+                      xaxis_tickangle=90, bargap=0.1)
+    fig.update_yaxes(tickformat=".0%", title="Percentage")
+    return fig
+
+
+# (x, y, chữ) của mọi nhãn; chữ của trace text được định dạng như plotly.js làm với ".0%"
+def old_labels(fig):
+    return sorted((int(a.x), a.y, a.text) for a in fig.layout.annotations)
+
+
+def new_labels(fig):
+    trace = fig.data[-1]
+    return sorted((int(x), y, f"{p:.0%}") for x, y, p in zip(trace.x, trace.y, trace.customdata))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--buckets", type=int, nargs="+", default=[12, 50, 200, 1000])
+    parser.add_argument("--old-max", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'buckets':>8} {'labels':>7} {'old (ms)':>9} {'new (ms)':>9} {'speedup':>8}")
+    for n in args.buckets:
+        filtered = grouped_frame(n)
+        ages = sorted(filtered['Age'].unique())
+        bar_args = (filtered, 'Mid', ages, font_size_by_count(len(ages)), max(400, min(1200, 50 * len(ages) + 100)))
+        new = sunburst_bar(*bar_args, COLOR_MAP)
+        t_new = median_time(lambda: sunburst_bar(*bar_args, COLOR_MAP).to_json(), args.repeat)
+        n_labels = len(new.data[-1].x)
+        if n > args.old_max:
+            print(f"{n:>8} {n_labels:>7} {'-':>9} {t_new:>9.1f} {'-':>8}")
+            continue
+        old = old_bar(*bar_args)
+        assert old_labels(old) == new_labels(new), f"labels differ for {n} buckets"
+        t_old = median_time(lambda: old_bar(*bar_args).to_json(), args.repeat)
+        print(f"{n:>8} {n_labels:>7} {t_old:>9.1f} {t_new:>9.1f} {t_old / t_new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
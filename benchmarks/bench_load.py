@@ -0,0 +1,59 @@
+# Đo thời gian cold start của load_data(): pd.read_excel so với cache columnar.
+#
+#   python benchmarks/bench_load.py --rows 5000 500000 5000000
+#
+# Dữ liệu lớn được tạo bằng cách lặp lại các dòng của education_career_success.xlsx.
+# Sheet xlsx tối đa 1,048,576 dòng nên các kích thước lớn hơn dùng file CSV làm nguồn.
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import _common  # noqa: F401 (đưa thư mục gốc vào sys.path)
+from data_cache import load_columnar, read_source
+
+XLSX_MAX_ROWS = 1_048_575
+
+
+def make_source(base, n_rows, workdir):
+    reps = -(-n_rows // len(base))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:n_rows]
+    df["Student_ID"] = [f"S{i:08d}" for i in range(n_rows)]
+    if n_rows <= XLSX_MAX_ROWS:
+        path = os.path.join(workdir, f"data_{n_rows}.xlsx")
+        df.to_excel(path, index=False)
+    else:
+        path = os.path.join(workdir, f"data_{n_rows}.csv")
+        df.to_csv(path, index=False)
+    return path
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000, 500_000, 5_000_000])
+    parser.add_argument("--source", default="education_career_success.xlsx")
+    args = parser.parse_args()
+
+    base = pd.read_excel(args.source)
+    print(f"{'rows':>10} {'source':>6} {'parse (s)':>10} {'convert (s)':>12} {'mmap (s)':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        cache_dir = os.path.join(workdir, "cache")
+        for n_rows in args.rows:
+            path = make_source(base, n_rows, workdir)
+            parse = timed(lambda: read_source(path))
+            convert = timed(lambda: load_columnar(path, cache_dir=cache_dir))
+            mmap = timed(lambda: load_columnar(path, cache_dir=cache_dir))
+            kind = os.path.splitext(path)[1][1:]
+            print(f"{n_rows:>10} {kind:>6} {parse:>10.3f} {convert:>12.3f} {mmap:>10.3f} {parse / mmap:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
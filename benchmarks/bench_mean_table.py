@@ -0,0 +1,80 @@
+# Trung bình Work_Life_Balance của line.py (Job Level × Age, một khoảng tuổi) và linechart.py
+# (Job Level × Years_to_Promotion) cho một lựa chọn Job Level: groupby trên frame, mean_by trên
+# cube rồi lọc level (cách cũ của hai trang), và MeanTable (mean_table.py) chỉ đọc các hàng của
+# level được chọn. Kiểm tra MeanTable cho đúng trung bình của cube và sai số chuẩn của
+# groupby().sem(), rồi đo thời gian theo số level được chọn.
+#
+#   python benchmarks/bench_mean_table.py --rows 100000 1000000
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from _common import median_time
+from cube import PROMOTION_DIMS, PROMOTION_MEASURES, build_cube, mean_by, slice_cube
+from generate_data import generate
+from mean_table import MeanTable
+
+LEVELS = ['Entry', 'Mid', 'Senior', 'Executive']
+MEASURE = 'Work_Life_Balance'
+
+
+# Như line.py / linechart.py trước đây: mean_by trên cả cube, Categorical, lọc level
+def cube_series(cube, x, levels, x_range=None):
+    source = cube if x_range is None else slice_cube(cube, age_range=x_range)
+    avg = mean_by(source, ['Current_Job_Level', x], MEASURE)
+    avg['Current_Job_Level'] = pd.Categorical(avg['Current_Job_Level'], categories=LEVELS, ordered=True)
+    avg = avg[avg['Current_Job_Level'].isin(levels)]
+    return [avg[avg['Current_Job_Level'] == level] for level in levels]
+
+
+def frame_series(df, x, levels, x_range=None):
+    rows = df[df['Current_Job_Level'].isin(levels)]
+    if x_range is not None:
+        rows = rows[rows[x].between(x_range[0], x_range[1])]
+    grouped = rows.groupby(['Current_Job_Level', x], observed=True)[MEASURE].agg(['mean', 'sem']).reset_index()
+    return [grouped[grouped['Current_Job_Level'] == level] for level in levels]
+
+
+def table_series(table, levels, x_range=None):
+    return [table.series(level, x_range) for level in levels]
+
+
+def check(df, cube, table, x, x_range):
+    for level, old, ref, new in zip(LEVELS, cube_series(cube, x, LEVELS, x_range),
+                                    frame_series(df, x, LEVELS, x_range), table_series(table, LEVELS, x_range)):
+        xs, mean, se = new
+        if not (np.array_equal(xs, old[x].to_numpy()) and np.array_equal(mean, old[MEASURE].to_numpy())):
+            raise SystemExit(f"{x} {level}: mean differs from the cube")
+        if not np.allclose(se, ref['sem'].to_numpy(), equal_nan=True):
+            raise SystemExit(f"{x} {level}: standard error differs from groupby().sem()")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'chart':>10} {'levels':>7} {'frame (ms)':>11} {'cube (ms)':>10} {'table (ms)':>11}")
+    for n_rows in args.rows:
+        df = pd.concat(generate(n_rows, seed=0), ignore_index=True)
+        cube, promotion_cube = build_cube(df), build_cube(df, PROMOTION_DIMS, PROMOTION_MEASURES)
+        charts = [
+            ('Age', cube, MeanTable(cube, 'Current_Job_Level', 'Age', MEASURE), (22, 28)),
+            ('Years_to_Promotion', promotion_cube,
+             MeanTable(promotion_cube, 'Current_Job_Level', 'Years_to_Promotion', MEASURE), None),
+        ]
+        for x, cube_, table, x_range in charts:
+            check(df, cube_, table, x, x_range)
+            name = 'line' if x == 'Age' else 'linechart'
+            for n_levels in (1, 2, 4):
+                levels = LEVELS[:n_levels]
+                t_frame = median_time(lambda: frame_series(df, x, levels, x_range), max(1, args.repeat // 5))
+                t_cube = median_time(lambda: cube_series(cube_, x, levels, x_range), args.repeat)
+                t_table = median_time(lambda: table_series(table, levels, x_range), args.repeat)
+                print(f"{n_rows:>10,} {name:>10} {n_levels:>7} {t_frame:>11.2f} {t_cube:>10.2f} {t_table:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
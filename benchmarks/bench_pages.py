@@ -0,0 +1,178 @@
+# Đo thời gian rerun của từng trang bằng streamlit AppTest: mỗi bước đổi một widget
+# (job level, khoảng tuổi, giới tính, trạng thái, biến hiển thị ...) rồi chạy lại script,
+# ghi p50/p95 theo phase load / filter / aggregate / figure và tổng thời gian rerun.
+# Phase figure = phần còn lại của rerun (dựng figure trong trang, widget ...), xem perf.breakdown.
+#
+#   python benchmarks/bench_pages.py --rounds 5 --out bench-before.json
+#   python benchmarks/bench_pages.py --rounds 5 --out bench-after.json
+#   python benchmarks/bench_pages.py --compare bench-before.json bench-after.json
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from _common import ROOT
+os.chdir(ROOT)
+import perf  # noqa: E402
+
+PAGES = [
+    "graphtab.py", "draftcuaple.py", "stackedbarchart.py", "donut.py", "sunburst.py",
+    "scatter.py", "line.py", "linechart.py",
+]
+METRICS = perf.PHASES + ["wall"]
+
+
+def _find(widgets, label):
+    for w in widgets:
+        if label in w.label:
+            return w
+    return None
+
+
+# Các thao tác của một người dùng trên trang: mỗi phần tử là (tên, widget, hai giá trị).
+# Mỗi thao tác luân phiên giữa hai giá trị để các lần rerun không giống hệt nhau.
+def interactions(at):
+    steps = []
+    selectboxes = list(at.sidebar.selectbox) + list(at.selectbox)
+    w = _find(selectboxes, "Job Level")
+    if w is not None:
+        steps.append(("level", w, ["Senior", "Entry"]))
+    w = _find(at.sidebar.multiselect, "Job Level")
+    if w is not None:
+        steps.append(("levels", w, [["Mid", "Senior"], list(w.value)]))
+    w = _find(at.sidebar.slider, "Age")
+    if w is not None:
+        steps.append(("age", w, [(20, 26), (w.min, w.max)]))
+    w = _find(at.sidebar.multiselect, "Select Gender")
+    if w is not None:
+        steps.append(("gender", w, [["Female", "Other"], list(w.value)]))
+    w = _find(selectboxes, "Select Gender")
+    if w is not None:
+        steps.append(("gender", w, ["Male", w.value]))
+    w = _find(selectboxes, "Select Entrepreneurship")
+    if w is not None:
+        steps.append(("status", w, ["Yes", w.value]))
+    w = _find(at.sidebar.multiselect, "Select Entrepreneurship")
+    if w is not None:
+        steps.append(("status", w, [["Yes"], list(w.value)]))
+    w = _find(at.sidebar.checkbox, "No")
+    if w is not None:
+        steps.append(("status", w, [False, True]))
+    w = _find(selectboxes, "Select GPA Group")
+    if w is not None:
+        steps.append(("gpa", w, [w.options[1], "All"]))
+    w = _find(at.slider, "Select Starting Salary Range")
+    if w is not None:
+        steps.append(("salary", w, [(w.min, (w.min + w.max) // 2), (w.min, w.max)]))
+    w = _find(selectboxes, "Select Variable")
+    if w is not None:
+        steps.append(("chart_option", w, ["Field of Study", "Gender"]))
+    return steps
+
+
+def timed_run(at):
+    perf.reset()
+    start = time.perf_counter()
+    at.run()
+    wall = time.perf_counter() - start
+    phases = {name: seconds * 1000 for name, seconds in perf.totals().items()}
+    sample = perf.breakdown(phases, wall * 1000)
+    sample["wall"] = wall * 1000
+    if at.exception:
+        raise RuntimeError(f"{at.exception[0].value}")
+    return sample
+
+
+def summarize(samples):
+    summary = {}
+    for name in METRICS:
+        values = np.array([s.get(name, 0.0) for s in samples])
+        summary[name] = {
+            "p50": round(float(np.percentile(values, 50)), 3),
+            "p95": round(float(np.percentile(values, 95)), 3),
+        }
+    return summary
+
+
+def bench_page(page, rounds):
+    st.cache_resource.clear()  # lần chạy đầu tiên: nạp lại dữ liệu từ cache cột trên đĩa
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=300)
+    cold = timed_run(at)
+
+    samples = []
+    for i in range(rounds):
+        for name, widget, values in interactions(at):
+            widget.set_value(values[i % 2])
+            samples.append(timed_run(at))
+    return {"cold_ms": round(cold["wall"], 3), "reruns": len(samples), **summarize(samples)}
+
+
+def commit_hash():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report):
+    print(f"commit {report['commit']}")
+    print(f"{'page':>18} {'cold':>9} {'n':>4}" + "".join(f" {name + ' p50/p95':>20}" for name in METRICS))
+    for page, result in report["pages"].items():
+        cells = "".join(f" {result[name]['p50']:>9.1f}/{result[name]['p95']:<10.1f}" for name in METRICS)
+        print(f"{page:>18} {result['cold_ms']:>9.1f} {result['reruns']:>4}{cells}")
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before['commit']} -> {after['commit']}  (p50 ms, thay đổi %)")
+    print(f"{'page':>18}" + "".join(f" {name:>22}" for name in METRICS))
+    for page, result in after["pages"].items():
+        if page not in before["pages"]:
+            continue
+        cells = ""
+        for name in METRICS:
+            if name not in result or name not in before["pages"][page]:
+                cells += f" {'-':>22}"  # phase chưa có ở commit cũ
+                continue
+            old, new = before["pages"][page][name]["p50"], result[name]["p50"]
+            change = (new - old) / old * 100 if old else 0.0
+            cells += f" {old:>8.1f}->{new:>7.1f} {change:>+4.0f}%"
+        print(f"{page:>18}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", nargs="*", default=PAGES)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--out")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    logging.disable(logging.WARNING)  # AppTest chạy ngoài `streamlit run` sẽ in cảnh báo mỗi lần
+    perf.enable()
+    report = {"commit": commit_hash(), "rounds": args.rounds, "pages": {}}
+    for page in args.pages:
+        report["pages"][page] = bench_page(page, args.rounds)
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
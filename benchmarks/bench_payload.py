@@ -0,0 +1,126 @@
+# Kích thước JSON mỗi biểu đồ gửi cho trình duyệt trước và sau payload.encode (typed array
+# float32 / int nhỏ nhất, làm tròn theo độ chính xác hiển thị, bỏ customdata không dùng), và thời
+# gian trình duyệt đọc JSON đó: JSON.parse rồi giải base64 thành typed array như plotly.js, đo
+# bằng node (bỏ qua nếu không có node). Biểu đồ: các figure của charts.py trên cube chính xác
+# và cube mẫu (có error bar), cùng hai dạng biểu đồ của scatter.py (điểm và heatmap mật độ).
+#
+#   python benchmarks/bench_payload.py --rows 1000000 --points 5000
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import _common  # noqa: F401 (đưa thư mục gốc vào sys.path)
+import charts
+import payload
+from cube import build_cube
+from generate_data import generate
+from large_scatter import binned_density
+from sample import build_sample_cube, stratified_sample
+from warmup import states
+
+# Đọc từng chuỗi JSON `repeat` lần, giải mọi {dtype, bdata}; in median ms của mỗi chuỗi
+NODE_SCRIPT = r"""
+const fs = require('fs');
+const [file, repeat] = [process.argv[2], Number(process.argv[3])];
+const TYPES = {f8: Float64Array, f4: Float32Array, i4: Int32Array, i2: Int16Array, i1: Int8Array,
+               u4: Uint32Array, u2: Uint16Array, u1: Uint8Array};
+function decode(v) {
+  if (Array.isArray(v)) return v.map(decode);
+  if (v === null || typeof v !== 'object') return v;
+  if (typeof v.bdata === 'string' && typeof v.dtype === 'string') {
+    const buf = Buffer.from(v.bdata, 'base64');
+    const bytes = new Uint8Array(buf).buffer;
+    const Type = TYPES[v.dtype.replace(/^[<>|]/, '')];
+    return new Type(bytes);
+  }
+  for (const k in v) v[k] = decode(v[k]);
+  return v;
+}
+const result = JSON.parse(fs.readFileSync(file, 'utf8')).map(s => {
+  const times = [];
+  for (let i = 0; i < repeat; i++) {
+    const start = process.hrtime.bigint();
+    decode(JSON.parse(s));
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  times.sort((a, b) => a - b);
+  return times[Math.floor(times.length / 2)];
+});
+console.log(JSON.stringify(result));
+"""
+
+
+def chart_figures(cube, sample_cube):
+    first = {}
+    for chart, state in states(cube):
+        first.setdefault(chart, state)
+    for cube_, preview in [(cube, False), (sample_cube, True)]:
+        for chart, state in first.items():
+            if chart.startswith('stacked_'):
+                fig = charts.stacked_figure(cube_, chart, **state, preview=preview)
+            else:
+                fig = charts.graphtab_figure(cube_, chart, **state, preview=preview)
+            if fig is not None:
+                yield f"{chart}{' (preview)' if preview else ''}", fig
+
+
+def scatter_figures(df, n_points):
+    points = df.sample(n_points, random_state=0)
+    fig = px.scatter(points, x="University_GPA", y="Starting_Salary", opacity=0.7, render_mode="webgl")
+    yield f"scatter ({n_points} pts)", fig
+
+    x_centers, y_centers, z = binned_density(df["University_GPA"].to_numpy(), df["Starting_Salary"].to_numpy())
+    yield "scatter density", go.Figure(go.Heatmap(x=x_centers, y=y_centers, z=z))
+
+
+def parse_times(json_strings, repeat):
+    node = shutil.which('node')
+    if node is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file, script = os.path.join(tmp, 'specs.json'), os.path.join(tmp, 'parse.js')
+        with open(data_file, 'w') as f:
+            json.dump(json_strings, f)
+        with open(script, 'w') as f:
+            f.write(NODE_SCRIPT)
+        out = subprocess.run([node, script, data_file, str(repeat)], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--points", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    df = pd.concat(generate(args.rows, seed=0), ignore_index=True)
+    cube, sample_cube = build_cube(df), build_sample_cube(stratified_sample(df))
+    figures = list(chart_figures(cube, sample_cube)) + list(scatter_figures(df, args.points))
+
+    before = [fig.to_json() for _, fig in figures]
+    after = [payload.encode(fig).to_json() for _, fig in figures]
+    times = parse_times(before + after, args.repeat)
+    if times is None:
+        print("node not found: parse time skipped")
+        times = [np.nan] * (2 * len(figures))
+
+    print(f"{'chart':>24} {'before (B)':>11} {'after (B)':>10} {'saved':>6} {'parse before':>13} {'parse after':>12}")
+    for i, (name, _) in enumerate(figures):
+        old, new = len(before[i].encode()), len(after[i].encode())
+        t_old, t_new = times[i], times[len(figures) + i]
+        print(f"{name:>24} {old:>11,} {new:>10,} {1 - new / old:>6.0%} {t_old:>10.3f} ms {t_new:>9.3f} ms")
+    total_old, total_new = sum(len(s.encode()) for s in before), sum(len(s.encode()) for s in after)
+    print(f"{'total':>24} {total_old:>11,} {total_new:>10,} {1 - total_new / total_old:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Kích thước payload (JSON gửi xuống trình duyệt) và thời gian dựng + serialize figure
+# của scatter.py ở từng chế độ vẽ: SVG, WebGL và heatmap mật độ.
+#
+#   python benchmarks/bench_scatter.py --rows 5000 100000 1000000
+#
+# Thời gian render trong trình duyệt không đo được ở đây (cần chạy headless browser).
+import argparse
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import _common  # noqa: F401 (đưa thư mục gốc vào sys.path)
+from large_scatter import binned_density, sample_positions
+
+
+def make_points(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    gpa = rng.uniform(2.0, 4.0, n_rows).round(2)
+    salary = (25_000 + 20_000 * (gpa - 2.0) + rng.normal(0, 15_000, n_rows)).clip(25_000, 150_000).round(-2)
+    return gpa, salary
+
+
+def build_points(gpa, salary, render_mode):
+    return px.scatter(x=gpa, y=salary, opacity=0.7, render_mode=render_mode)
+
+
+def build_density(gpa, salary):
+    x_centers, y_centers, z = binned_density(gpa, salary)
+    fig = go.Figure(go.Heatmap(x=x_centers, y=y_centers, z=z, colorscale="Blues"))
+    rows = sample_positions(len(gpa))
+    fig.add_trace(go.Scattergl(x=gpa[rows], y=salary[rows], mode="markers"))
+    return fig
+
+
+def measure(build):
+    start = time.perf_counter()
+    payload = build().to_json()
+    return len(payload), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    # làm nóng import/validator của plotly
+    measure(lambda: build_points(*make_points(100), "svg"))
+    measure(lambda: build_density(*make_points(100)))
+    print(f"{'rows':>10} {'mode':>8} {'payload (KiB)':>14} {'build+json (ms)':>16}")
+    for n_rows in args.rows:
+        gpa, salary = make_points(n_rows)
+        modes = [
+            ("svg", lambda: build_points(gpa, salary, "svg")),
+            ("webgl", lambda: build_points(gpa, salary, "webgl")),
+            ("density", lambda: build_density(gpa, salary)),
+        ]
+        for mode, build in modes:
+            size, seconds = measure(build)
+            print(f"{n_rows:>10} {mode:>8} {size / 1024:>14.1f} {seconds * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import numpy as np
+
+import figure_spec as fs
+from cube import mean_by, percentage_by_age, slice_cube, value_counts
+from density import age_density_by
+from sample import mean_by_ci, percentage_by_age_ci
+
+# Figure của graphtab.py, stackedbarchart.py (và biểu đồ % của sunburst.py), dựng chỉ từ cube và trạng thái bộ lọc đã
+# chuẩn hóa (cũng là key của figure cache). Trang và warmup.py dùng chung các hàm này nên
+# figure dựng trước luôn giống hệt figure trang tự dựng.
+#
+# Trạng thái bộ lọc: genders / statuses là None (không lọc) hoặc tuple đã sắp xếp,
+# level là một Job Level, age_range là (min, max); preview=True khi cube là cube mẫu.
+# Figure được ghép thẳng từ dict (figure_spec.py), cùng spec với plotly.express / go.Figure.
+COLOR_MAP = {'Yes': '#FFD700', 'No': '#004080'}
+CHART_OPTIONS = ['Gender', 'Field of Study']
+
+
+# Thứ tự các đường Job_Offers như trên trang: Yes trước No
+def selected_statuses(statuses):
+    return ['Yes', 'No'] if statuses is None else [s for s in ['Yes', 'No'] if s in statuses]
+
+
+# ---- graphtab.py ----
+
+# (cube_level, cube_filtered): slice theo giới tính, level, khoảng tuổi (mọi status, để tính %)
+# và slice đã lọc thêm theo status
+def graphtab_slices(cube, genders, level, age_range, statuses):
+    cube_level = slice_cube(slice_cube(cube, genders=genders), level=level, age_range=age_range)
+    return cube_level, slice_cube(cube_level, statuses=selected_statuses(statuses))
+
+
+def graphtab_bar(cube_level, level, statuses, preview=False):
+    statuses = selected_statuses(statuses)
+    df_grouped = percentage_by_age_ci(cube_level) if preview else percentage_by_age(cube_level)
+    df_bar = df_grouped[df_grouped['Entrepreneurship'].isin(statuses)]
+
+    even_ages = sorted(df_bar['Age'].unique())
+    even_ages = [age for age in even_ages if age % 2 == 0]
+
+    data = fs.px_bar_traces(df_bar, 'Age', 'Percentage', 'Entrepreneurship', ['No', 'Yes'], COLOR_MAP,
+                            error_y='CI' if preview else None)
+    # Mỗi trace là một trạng thái nên tên trạng thái ghi thẳng vào hovertemplate, không cần customdata
+    for trace in data:
+        trace.update(
+            hovertemplate=f"Entrepreneurship={trace['name']}<br>Age=%{{x}}<br>Percentage=%{{y:.0%}}<extra></extra>",
+            hoverinfo="skip"
+        )
+
+    layout = fs.px_bar_layout(data, 'Age', 'Percentage', 'Entrepreneurship',
+                              f"Entrepreneurship Distribution by Age – {level} Level", height=450, width=1250)
+    layout['margin'] = dict(t=40, l=40, r=40, b=40)
+    layout['legend'].update(title=fs.title('Entrepreneurship'), orientation='h', yanchor='bottom', y=-0.3,
+                            xanchor='center', x=0.5)
+    layout['xaxis'].update(tickangle=0, tickvals=fs.int_list(even_ages))
+    layout['yaxis'].update(title=fs.title("Percentage"), range=[0, 1], tickformat=".0%")
+    layout['bargap'] = 0.1
+    return fs.figure(data, layout)
+
+
+def graphtab_line(cube_filtered, statuses, preview=False):
+    if preview:
+        df_avg_offers = mean_by_ci(cube_filtered, ['Age', 'Entrepreneurship'], 'Job_Offers')
+    else:
+        df_avg_offers = mean_by(cube_filtered, ['Age', 'Entrepreneurship'], 'Job_Offers')
+    even_ages = [age for age in sorted(df_avg_offers['Age'].unique()) if age % 2 == 0]
+
+    data = []
+    for status in selected_statuses(statuses):
+        data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
+        trace = fs.scatter(
+            data_status["Age"],
+            data_status["Job_Offers"],
+            mode="lines+markers",
+            name=status,
+            line=dict(color=COLOR_MAP[status], width=2),
+            marker=dict(size=6),
+            hovertemplate="%{y:.2f}"
+        )
+        if preview:
+            trace['error_y'] = dict(type='data', array=fs.array(data_status['CI']))
+        data.append(trace)
+
+    spikes = dict(showspikes=True, spikemode='across', spikesnap='cursor', spikethickness=1.2, spikedash='dot')
+    layout = dict(
+        margin=dict(t=40, l=40, r=40, b=40),
+        legend=dict(title=fs.title('Entrepreneurship'), orientation='h', yanchor='bottom', y=-0.3,
+                    xanchor='center', x=0.5),
+        xaxis=dict(tickangle=0, tickvals=fs.int_list(even_ages), **spikes),
+        yaxis=dict(title=fs.title("Average Job Offers"), **spikes),
+        hovermode="x unified",
+        width=1250
+    )
+    return fs.figure(data, layout)
+
+
+def graphtab_density(cube_filtered, option, age_range):
+    group_col = 'Gender' if option == 'Gender' else 'Field_of_Study'
+    title = f"Age Distribution by {group_col.replace('_', ' ')}"
+    x_vals = np.linspace(age_range[0], age_range[1], 100)
+
+    data = [
+        fs.scatter(x_vals, y_vals, mode='lines', name=str(cat), fill='tozeroy')
+        for cat, y_vals in age_density_by(cube_filtered, group_col, x_vals)
+    ]
+    layout = dict(
+        title=fs.title(title),
+        xaxis=dict(title=fs.title("Age")),
+        yaxis=dict(title=fs.title("Density")),
+        height=500,
+        margin=dict(t=40, l=40, r=40, b=80),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5)
+    )
+    return fs.figure(data, layout)
+
+
+def graphtab_donut(cube_filtered, option):
+    group_col = 'Gender' if option == 'Gender' else 'Field_of_Study'
+    counts = value_counts(cube_filtered, group_col)
+
+    data = [fs.pie(counts[group_col], counts['Count'], hole=0.5)]
+    layout = dict(
+        title=fs.title(f"{option} Distribution (Donut Chart)"),
+        height=350,
+        margin=dict(t=40, l=40, r=40, b=40),
+        showlegend=True
+    )
+    return fs.figure(data, layout)
+
+
+def graphtab_figure(cube, chart, genders, level, age_range, statuses, option=None, preview=False):
+    cube_level, cube_filtered = graphtab_slices(cube, genders, level, age_range, statuses)
+    if chart == 'bar':
+        return graphtab_bar(cube_level, level, statuses, preview)
+    if chart == 'line':
+        return graphtab_line(cube_filtered, statuses, preview)
+    if cube_filtered.empty:  # trang hiện cảnh báo thay cho density / donut
+        return None
+    if chart == 'density':
+        return graphtab_density(cube_filtered, option, age_range)
+    return graphtab_donut(cube_filtered, option)
+
+
+# ---- stackedbarchart.py ----
+
+def stacked_bar(cube_level, level, statuses, preview=False):
+    df_bar = percentage_by_age_ci(cube_level) if preview else percentage_by_age(cube_level)
+    if statuses is not None:
+        df_bar = df_bar[df_bar['Entrepreneurship'].isin(statuses)]
+
+    data = fs.px_bar_traces(df_bar, 'Age', 'Percentage', 'Entrepreneurship', ['No', 'Yes'], COLOR_MAP,
+                            error_y='CI' if preview else None)
+    # Biểu đồ bar nằm phía trên – cao hơn chút
+    layout = fs.px_bar_layout(data, 'Age', 'Percentage', 'Entrepreneurship',
+                              f"Entrepreneurship Distribution by Age – {level} Level", height=450)
+    layout['xaxis'].update(categoryorder='array', categoryarray=fs.int_list(sorted(df_bar['Age'].unique())),
+                           tickangle=90)
+    layout['yaxis'].update(tickformat=".0%", title=fs.title("Percentage"))
+    layout['legend']['title'] = fs.title('Entrepreneurship')
+    layout.update(margin=dict(t=40, l=40, r=40, b=40), bargap=0.1)
+    return fs.figure(data, layout)
+
+
+def stacked_line(cube_level, level, statuses, preview=False):
+    statuses = selected_statuses(statuses)
+    cube_status = slice_cube(cube_level, statuses=statuses)
+    if preview:
+        df_avg_offers = mean_by_ci(cube_status, ['Age', 'Entrepreneurship'], 'Job_Offers')
+    else:
+        df_avg_offers = mean_by(cube_status, ['Age', 'Entrepreneurship'], 'Job_Offers')
+
+    data = []
+    for status in statuses:  # ['Yes', 'No'] hoặc ['Yes'] hoặc ['No']
+        data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
+        trace = fs.scatter(
+            data_status["Age"],
+            data_status["Job_Offers"],
+            mode="lines+markers",
+            name=status,
+            line=dict(color=COLOR_MAP[status], width=2),
+            marker=dict(size=6),
+            hovertemplate="%{y:.2f}"  # chỉ hiện giá trị, tên và màu line sẽ auto hiện
+        )
+        if preview:
+            trace['error_y'] = dict(type='data', array=fs.array(data_status['CI']))
+        data.append(trace)
+
+    # Biểu đồ line nằm phía dưới – thấp hơn
+    layout = dict(
+        title=fs.title(f"Average Job Offers by Age – {level} Level"),
+        height=300,
+        margin=dict(t=40, l=40, r=40, b=40),
+        legend=dict(title=fs.title('Entrepreneurship')),
+        hovermode="x unified",  # 👈 để vẫn hiện cả 2 điểm cùng lúc
+        xaxis=dict(
+            title=fs.title("Age"),
+            tickangle=90,
+            showspikes=True,
+            spikemode='across',
+            spikesnap='cursor',
+            spikethickness=1.2,
+            spikedash='dot',
+            spikecolor='gray'
+        ),
+        yaxis=dict(title=fs.title("Average Job Offers"))
+    )
+    return fs.figure(data, layout)
+
+
+def stacked_figure(cube, chart, genders, level, age_range, statuses, preview=False):
+    cube_level = slice_cube(slice_cube(cube, genders=genders), level=level, age_range=age_range)
+    if chart == 'stacked_bar':
+        return stacked_bar(cube_level, level, statuses, preview)
+    return stacked_line(cube_level, level, statuses, preview)
+
+
+# ---- sunburst.py ----
+
+# Cột % chồng theo tuổi kèm nhãn % (No ở y = 0.2, Yes ở y = 0.9). Nhãn là một trace text cho mọi
+# cột, plotly.js tự định dạng từ customdata: một bước cho cả frame thay vì một annotation mỗi cột,
+# nên dựng nhanh cả khi có hàng trăm nhóm tuổi.
+def sunburst_bar(filtered, level, ages, font_size, width, color_map):
+    data = fs.px_bar_traces(filtered, 'Age', 'Percentage', 'Entrepreneurship', ['No', 'Yes'], color_map)
+    layout = fs.px_bar_layout(data, 'Age', 'Percentage', 'Entrepreneurship',
+                              f"{level} Level – Entrepreneurship by Age (%)", height=400, width=width)
+
+    labels = filtered[filtered['Percentage'] > 0]
+    data.append(fs.scatter(
+        labels['Age'],
+        np.where(labels['Entrepreneurship'] == 'No', 0.2, 0.9),
+        customdata=fs.array(labels['Percentage']),
+        texttemplate="%{customdata:.0%}",
+        mode='text',
+        textposition='middle center',
+        textfont=dict(color="white", size=font_size),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+    layout['xaxis'].update(categoryorder='array', categoryarray=fs.int_list(ages), tickangle=90)
+    layout['yaxis'].update(tickformat=".0%", title=fs.title("Percentage"))
+    layout['legend']['title'] = fs.title('Entrepreneurship')
+    layout.update(margin=dict(t=40, l=40, r=40, b=40), bargap=0.1)
+    return fs.figure(data, layout)
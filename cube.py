@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+# Các chiều lọc nhỏ (vài nghìn ô) – mọi biểu đồ cột/đường/donut đều trả lời được
+# bằng cách cắt cube thay vì quét lại từng dòng dữ liệu
+CUBE_DIMS = ['Current_Job_Level', 'Age', 'Entrepreneurship', 'Gender', 'Field_of_Study']
+CUBE_MEASURES = ['Job_Offers', 'Work_Life_Balance', 'Starting_Salary']
+
+# Cube nhỏ cho linechart.py: Work_Life_Balance theo Job Level × Years_to_Promotion
+PROMOTION_DIMS = ['Current_Job_Level', 'Years_to_Promotion']
+PROMOTION_MEASURES = ['Work_Life_Balance']
+
+
+# First_Row = vị trí dòng đầu tiên của ô, để giữ đúng thứ tự xuất hiện như unique()/value_counts().
+# *_sumsq = tổng bình phương (cho phương sai / sai số chuẩn), cộng được như Count và *_sum.
+def build_cube(df, dims=CUBE_DIMS, measures=CUBE_MEASURES):
+    aggs = {'Count': (dims[0], 'size'), 'First_Row': ('_row', 'min')}
+    aggs.update({f"{m}_sum": (m, 'sum') for m in measures})
+    aggs.update({f"{m}_sumsq": (f"_{m}_sq", 'sum') for m in measures})
+    squares = {f"_{m}_sq": df[m].astype('int64') ** 2 for m in measures}
+    rows = df[dims + measures].assign(_row=np.arange(len(df)), **squares)
+    cube = rows.groupby(dims, observed=True, dropna=False).agg(**aggs).reset_index()
+    # Tổng của cột int8/int16 luôn để int64, không để pandas ép về kiểu nhỏ của cột gốc
+    return cube.astype({f"{m}_{total}": 'int64' for m in measures for total in ('sum', 'sumsq')})
+
+
+# Cộng cube của các dòng mới nối thêm vào cube cũ: cộng Count, *_sum và *_sumsq, lấy min của
+# First_Row. First_Row của `delta` phải đã được dời theo số dòng cũ (xem append_rows).
+# Chi phí theo số ô của hai cube, không theo số dòng dữ liệu.
+@timed('aggregate')
+def merge_cubes(cube, delta, dims=CUBE_DIMS):
+    aggs = {c: 'min' if c == 'First_Row' else 'sum' for c in cube.columns if c not in dims}
+    merged = pd.concat([cube, delta], ignore_index=True)
+    return merged.groupby(dims, observed=True, dropna=False).agg(aggs).reset_index()
+
+
+# Cube sau khi nối thêm các dòng `rows` (DataFrame) vào dữ liệu đã có cube `cube`
+def append_rows(cube, rows, dims=CUBE_DIMS, measures=CUBE_MEASURES):
+    delta = build_cube(rows, dims, measures)
+    delta['First_Row'] += int(cube['Count'].sum())
+    return merge_cubes(cube, delta, dims).astype({dim: cube[dim].dtype for dim in dims})
+
+
+# None = không lọc chiều đó; list rỗng = không lấy ô nào (giống isin([]) trên dữ liệu gốc).
+# cube cũng có thể là AgePrefix / AgeWindow (age_prefix.py): khoảng tuổi trả lời từ tổng cộng dồn.
+@timed('filter')
+def slice_cube(cube, level=None, age_range=None, statuses=None, genders=None, fields=None):
+    if not isinstance(cube, pd.DataFrame):
+        return cube.slice(level=level, age_range=age_range, statuses=statuses, genders=genders, fields=fields)
+    mask = np.ones(len(cube), dtype=bool)
+    if level is not None:
+        mask &= (cube['Current_Job_Level'] == level).to_numpy()
+    if age_range is not None:
+        mask &= cube['Age'].between(age_range[0], age_range[1]).to_numpy()
+    if statuses is not None:
+        mask &= cube['Entrepreneurship'].isin(statuses).to_numpy()
+    if genders is not None:
+        mask &= cube['Gender'].isin(genders).to_numpy()
+    if fields is not None:
+        mask &= cube['Field_of_Study'].isin(fields).to_numpy()
+    return cube[mask]
+
+
+# Gộp cube theo một số chiều: cộng Count và các cột *_sum (cả Sample_Count và *_sumsq của
+# cube mẫu trong sample.py), lấy min của First_Row
+@timed('aggregate')
+def rollup(cube, by):
+    if not isinstance(cube, pd.DataFrame):
+        return cube.rollup(by)
+    aggs = {c: 'sum' for c in cube.columns if c in ('Count', 'Sample_Count') or c.endswith(('_sum', '_sumsq'))}
+    aggs['First_Row'] = 'min'
+    return cube.groupby(by, observed=True).agg(aggs).reset_index()
+
+
+# Tỉ lệ Yes/No trong từng độ tuổi (tính trên các status có trong slice)
+@timed('aggregate')
+def percentage_by_age(cube):
+    grouped = rollup(cube, ['Age', 'Entrepreneurship'])[['Age', 'Entrepreneurship', 'Count']]
+    grouped['Percentage'] = grouped['Count'] / grouped.groupby('Age')['Count'].transform('sum')
+    return grouped
+
+
+# Trung bình của một measure theo các chiều `by`, ví dụ Job_Offers theo Age × Entrepreneurship
+@timed('aggregate')
+def mean_by(cube, by, measure='Job_Offers'):
+    grouped = rollup(cube, by)
+    grouped[measure] = grouped[f"{measure}_sum"] / grouped['Count']
+    return grouped[by + [measure]]
+
+
+# Tương đương df[column].value_counts() trên các dòng thuộc slice
+@timed('aggregate')
+def value_counts(cube, column):
+    counts = rollup(cube, [column]).sort_values('First_Row')
+    counts = counts.sort_values('Count', ascending=False, kind='stable')[[column, 'Count']]
+    return counts[counts['Count'] > 0].reset_index(drop=True)
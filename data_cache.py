@@ -0,0 +1,193 @@
+import hashlib
+import os
+import re
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Thư mục chứa bản columnar (Arrow IPC) của file dữ liệu gốc
+CACHE_DIR = ".cache"
+
+
+# Hash nội dung file -> đổi file (kể cả giữ nguyên tên) sẽ ra cache mới
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_HASH = re.compile(r"[0-9a-f]{16}")
+
+
+# Sau khi ghi xong một file cache, xóa các bản khác của nó: cùng tên, chỉ khác các đoạn hash
+# (hash nội dung file gốc, hash code ...). Mỗi lần file gốc hoặc code đổi không để lại thêm một
+# bản đầy đủ trong cache_dir. File đang bị process khác giữ (Windows) thì để lần sau.
+def remove_stale(path):
+    directory, keep = os.path.split(path)
+    pattern = re.compile(_HASH.sub("[0-9a-f]{16}", re.escape(keep)))
+    for name in os.listdir(directory or "."):
+        if name != keep and pattern.fullmatch(name):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+# Số dòng mỗi chunk khi đọc xlsx theo kiểu streaming
+XLSX_CHUNK_ROWS = 50_000
+
+
+# Một cột của chunk thành mảng Arrow đúng kiểu; ô trống thành null (NaN khi sang pandas,
+# giống pd.read_excel). Object Python của chunk được giải phóng ngay sau đó.
+def _column_array(values, dtype):
+    if dtype is str or isinstance(dtype, pd.CategoricalDtype):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    if dtype is not None and np.dtype(dtype).kind in "iuf":
+        if None in values:
+            return pa.array(np.array([np.nan if v is None else v for v in values], dtype="float64"))
+        return pa.array(np.array(values, dtype=dtype))
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):  # cột lẫn số và chữ
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _arrow_type(dtype):
+    if dtype is None or dtype is str or isinstance(dtype, pd.CategoricalDtype):
+        return pa.string()
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+# Đọc xlsx bằng openpyxl read-only (iter_rows) theo từng chunk chunk_rows dòng: mỗi lần chỉ
+# giữ tuple Python của một chunk rồi chuyển ngay thành một bảng Arrow, cột theo dtype.
+# progress(số dòng đã đọc, tổng số dòng hoặc None) được gọi sau mỗi chunk.
+def iter_xlsx(path, sheet_name=0, dtype=None, chunk_rows=XLSX_CHUNK_ROWS, progress=None):
+    from openpyxl import load_workbook
+
+    dtype = dtype or {}
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        total = sheet.max_row - 1 if sheet.max_row else None
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(name) for name in next(rows)]
+
+        done = 0
+        while True:
+            batch = list(islice(rows, chunk_rows))
+            if not batch:
+                break
+            # Bỏ các dòng trống (thường ở cuối sheet), giống pd.read_excel
+            batch = [row for row in batch if any(v is not None for v in row)]
+            if batch:
+                columns = [_column_array(list(values), dtype.get(name)) for name, values in zip(header, zip(*batch))]
+                yield pa.Table.from_arrays(columns, names=header)
+            done += len(batch)
+            if progress is not None:
+                progress(done, total)
+        if done == 0:  # sheet chỉ có dòng tiêu đề
+            yield pa.table({name: pa.array([], _arrow_type(dtype.get(name))) for name in header})
+    finally:
+        workbook.close()
+
+
+# Cả sheet thành DataFrame. Bảng Arrow được chuyển sang pandas với self_destruct nên
+# bộ nhớ đỉnh chỉ cỡ 2 lần frame.
+def read_xlsx(path, sheet_name=0, dtype=None, chunk_rows=XLSX_CHUNK_ROWS, progress=None):
+    tables = list(iter_xlsx(path, sheet_name, dtype, chunk_rows, progress))
+    table = pa.concat_tables(tables, promote_options="permissive")
+    del tables
+    return table.to_pandas(self_destruct=True, split_blocks=True).astype(dtype or {})
+
+
+def read_source(path, sheet_name=0, dtype=None, progress=None):
+    if path.lower().endswith(".csv"):
+        return pd.read_csv(path, dtype=dtype)
+    if path.lower().endswith(".parquet"):
+        return pd.read_parquet(path)
+    return read_xlsx(path, sheet_name, dtype=dtype, progress=progress)
+
+
+# digest: hash nội dung file nếu đã có (data_manager.Snapshot.digest), để không hash lại file
+def columnar_path(path, sheet_name=0, cache_dir=CACHE_DIR, digest=None):
+    name = os.path.splitext(os.path.basename(path))[0]
+    key = f"{(digest or file_hash(path))[:16]}-{sheet_name}"
+    return os.path.join(cache_dir, f"{name}-{key}.arrow")
+
+
+def write_columnar(df, arrow_path):
+    os.makedirs(os.path.dirname(arrow_path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Ghi ra file tạm rồi os.replace để process khác không đọc phải file dở dang.
+    # Không nén để file có thể memory-map trực tiếp.
+    tmp_path = f"{arrow_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    remove_stale(arrow_path)
+
+
+def read_columnar(arrow_path):
+    with pa.memory_map(arrow_path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+# Đọc file xlsx/csv qua cache columnar: lần đầu parse file gốc và ghi Arrow IPC,
+# các lần sau chỉ memory-map file .arrow thay vì parse lại XML của workbook.
+# progress chỉ được gọi khi phải parse file gốc. convert(df) (kiểm tra, ép kiểu ...) chạy trên
+# frame vừa parse, trước khi ghi cache.
+def load_columnar(path, sheet_name=0, cache_dir=CACHE_DIR, dtype=None, progress=None, convert=None, digest=None):
+    arrow_path = columnar_path(path, sheet_name, cache_dir, digest)
+    if not os.path.exists(arrow_path):
+        df = read_source(path, sheet_name, dtype=dtype, progress=progress)
+        write_columnar(df if convert is None else convert(df), arrow_path)
+    return read_columnar(arrow_path)
+
+
+def parquet_path(path, sheet_name=0, cache_dir=CACHE_DIR, digest=None):
+    return os.path.splitext(columnar_path(path, sheet_name, cache_dir, digest))[0] + ".parquet"
+
+
+def _write_parquet(tables, out_path):
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        for table in tables:
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)  # mỗi chunk một row group
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, out_path)
+    remove_stale(out_path)
+
+
+# Bản Parquet của file dữ liệu cho các engine đọc thẳng từ đĩa (sql_backend.py). File .parquet
+# được dùng nguyên; xlsx/csv được chuyển từng chunk một lần vào cache_dir, không bao giờ nạp
+# cả file vào RAM nên dùng được với dữ liệu lớn hơn bộ nhớ.
+def load_parquet(path, sheet_name=0, cache_dir=CACHE_DIR, dtype=None, progress=None, digest=None):
+    if path.lower().endswith(".parquet"):
+        return path
+    out_path = parquet_path(path, sheet_name, cache_dir, digest)
+    if not os.path.exists(out_path):
+        if path.lower().endswith(".csv"):
+            import pyarrow.csv
+
+            column_types = {name: _arrow_type(t) for name, t in (dtype or {}).items()}
+            reader = pyarrow.csv.open_csv(path, convert_options=pyarrow.csv.ConvertOptions(column_types=column_types))
+            tables = (pa.Table.from_batches([batch]) for batch in reader)
+        else:
+            tables = iter_xlsx(path, sheet_name, dtype=dtype, progress=progress)
+        _write_parquet(tables, out_path)
+    return out_path
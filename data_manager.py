@@ -0,0 +1,260 @@
+import logging
+import os
+import threading
+import time
+import weakref
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from data_cache import file_hash
+
+logger = logging.getLogger(__name__)
+
+# Theo dõi file dữ liệu (mtime, kích thước rồi hash nội dung). Khi file đổi, một thread nền
+# dựng lại đúng những phần dẫn xuất (frame, cube, index, figure cache ...) mà phiên bản cũ
+# đã dùng, xong mới đổi sang phiên bản mới bằng một phép gán. Người dùng không phải chờ:
+# trong lúc dựng, các lần rerun vẫn dùng phiên bản cũ.
+#
+# Dữ liệu = file gốc + các file delta (.csv/.parquet, chỉ chứa Student_ID mới) thả vào
+# delta_dir, nối theo thứ tự tên file. Mỗi file delta chỉ được nối một lần: các phần có
+# appender (cube ...) được cập nhật theo kích thước của delta thay vì tính lại từ đầu, các
+# phần còn lại mà phiên bản cũ đã dùng được dựng lại trước khi đổi phiên bản. Delta có
+# Student_ID đã có trong dữ liệu bị bỏ qua. Khi file gốc đổi, mọi phần được dựng lại từ file
+# gốc mới cộng các delta đã nối, trừ các delta mà file gốc mới đã chứa.
+POLL_INTERVAL = 2.0
+DELTA_SUFFIXES = ('.csv', '.parquet')
+
+
+def _stat(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+# Một phiên bản dữ liệu: các phần được dựng lười bằng builders[name](snapshot) và giữ nguyên
+# suốt đời phiên bản, nên frame, cube và index lấy từ cùng một snapshot luôn khớp nhau.
+# deltas: các DataFrame nối thêm sau file gốc, builders phải tính cả chúng.
+class Snapshot:
+    def __init__(self, path, digest, builders, deltas=()):
+        self.path = path
+        self.digest = digest
+        self.deltas = deltas
+        self._builders = builders
+        self._parts = {}
+        # Mỗi phần một lock: đang dựng cube (lâu) không chặn việc lấy các phần khác
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._prefetching = set()
+
+    def get(self, name):
+        try:
+            return self._parts[name]
+        except KeyError:
+            pass
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._parts:
+                self._parts[name] = self._builders[name](self)
+            return self._parts[name]
+
+    def ready(self, name):
+        return name in self._parts
+
+    # Dựng phần `name` trong thread nền (một lần), không chờ
+    def prefetch(self, name):
+        with self._lock:
+            if name in self._parts or name in self._prefetching:
+                return
+            self._prefetching.add(name)
+        threading.Thread(target=self._prefetch, args=(name,), name=f"prefetch-{name}", daemon=True).start()
+
+    def _prefetch(self, name):
+        try:
+            self.get(name)
+        except Exception:  # lần get() sau trong script sẽ dựng lại và báo lỗi
+            logger.exception("Could not build %s", name)
+        finally:
+            with self._lock:
+                self._prefetching.discard(name)
+
+    def built(self):
+        return list(self._parts)
+
+
+# appenders[name](part, delta) trả về phần `name` sau khi nối DataFrame delta vào dữ liệu
+# read_delta(path) đọc một file delta thành DataFrame (đúng cột, đúng kiểu)
+# known_ids(snapshot, delta) trả về các Student_ID của delta đã có trong dữ liệu của snapshot
+class DataManager:
+    def __init__(self, path, builders, appenders=None, delta_dir=None, read_delta=None, known_ids=None,
+                 poll_interval=POLL_INTERVAL, watch=True):
+        self.path = path
+        self.builders = builders
+        self.appenders = appenders or {}
+        self.delta_dir = delta_dir
+        self.read_delta = read_delta
+        self.known_ids = known_ids
+        self.poll_interval = poll_interval
+        self.version = 1
+        self._stat = _stat(path)
+        self._seen = self._stat
+        self._delta_seen = {}
+        self._delta_done = set()
+        self._check_lock = threading.Lock()
+
+        # Các delta đã có sẵn lúc khởi động được tính luôn vào phiên bản đầu tiên
+        snapshot = Snapshot(path, file_hash(path), builders)
+        for name in sorted(self._delta_stats()):
+            self._delta_done.add(name)
+            delta = self._read(name, snapshot)
+            if delta is not None:
+                snapshot = self._extend(snapshot, delta)
+        self._current = snapshot
+        self._pins = weakref.WeakKeyDictionary()
+        if watch:
+            thread = threading.Thread(
+                target=_watch, args=(weakref.ref(self), poll_interval), name="data-manager", daemon=True
+            )
+            thread.start()
+
+    # Snapshot cho lần rerun hiện tại. Lần gọi đầu tiên trong một lần chạy script ghim snapshot
+    # mới nhất cho session; các lần gọi sau trong cùng lần chạy nhận lại đúng snapshot đó, kể cả
+    # khi phiên bản mới vừa được đổi vào giữa chừng. ctx.cursors được tạo mới mỗi lần chạy;
+    # ghim theo ctx.session_state (sống cùng session, ctx là dataclass không hash được).
+    def current(self):
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is None:
+            return self._current
+        pin = self._pins.get(ctx.session_state)
+        if pin is not None and pin[0] is ctx.cursors:
+            return pin[1]
+        snapshot = self._current
+        self._pins[ctx.session_state] = (ctx.cursors, snapshot)
+        return snapshot
+
+    # Nối DataFrame delta (các dòng mới) vào phiên bản hiện tại và đổi sang phiên bản mới.
+    # ValueError nếu delta có Student_ID đã có trong dữ liệu.
+    def append(self, delta):
+        with self._check_lock:
+            self._check_ids(self._current, delta)
+            self._append(delta)
+        return self.version
+
+    # Snapshot của dữ liệu `old` + delta: các phần có appender được cập nhật, còn lại chưa dựng
+    def _extend(self, old, delta):
+        snapshot = Snapshot(self.path, old.digest, self.builders, old.deltas + (delta,))
+        for name in old.built():
+            if name in self.appenders:
+                snapshot._parts[name] = self.appenders[name](old.get(name), delta)
+        return snapshot
+
+    def _append(self, delta):
+        old = self._current
+        snapshot = self._extend(old, delta)
+        # Như khi file gốc đổi: các phần không có appender (index, trendline, backend ...) được
+        # dựng lại ở đây, để lần rerun sau không phải chờ
+        for name in old.built():
+            snapshot.get(name)
+        self._current = snapshot
+        self.version += 1
+        logger.info("Appended %d rows to %s, version %d", len(delta), self.path, self.version)
+
+    # Trả về True nếu đã đổi sang phiên bản mới. File phải đứng yên (mtime, kích thước không
+    # đổi) qua hai lần kiểm tra liên tiếp rồi mới được đọc, để không đọc phải file đang ghi dở.
+    def check(self):
+        with self._check_lock:
+            changed = self._check_source()
+            for name in self._stable_deltas():
+                delta = self._read(name, self._current)
+                if delta is not None:
+                    self._append(delta)
+                    changed = True
+            return changed
+
+    def _check_source(self):
+        try:
+            stat = _stat(self.path)
+        except FileNotFoundError:  # file đang được thay thế
+            return False
+        if stat == self._stat:
+            return False
+        if stat != self._seen:
+            self._seen = stat
+            return False
+
+        # Dù dựng được hay lỗi (file hỏng), chỉ thử lại khi file đổi tiếp
+        self._stat = stat
+        digest = file_hash(self.path)
+        if digest == self._current.digest:  # chỉ đổi mtime, nội dung như cũ
+            return False
+
+        # Delta có Student_ID mà file gốc mới đã chứa (file được xuất lại cùng các dòng đó) bị bỏ
+        snapshot = Snapshot(self.path, digest, self.builders)
+        for delta in self._current.deltas:
+            try:
+                self._check_ids(snapshot, delta)
+            except ValueError as error:
+                logger.warning("Dropped an appended delta of %d rows: %s", len(delta), error)
+                continue
+            snapshot = self._extend(snapshot, delta)
+        for name in self._current.built():
+            snapshot.get(name)
+        self._current = snapshot
+        self.version += 1
+        logger.info("Loaded %s version %d (%s)", self.path, self.version, digest[:12])
+        return True
+
+    def _delta_stats(self):
+        if not self.delta_dir or not os.path.isdir(self.delta_dir):
+            return {}
+        stats = {}
+        for name in os.listdir(self.delta_dir):
+            if name.lower().endswith(DELTA_SUFFIXES) and name not in self._delta_done:
+                try:
+                    stats[name] = _stat(os.path.join(self.delta_dir, name))
+                except FileNotFoundError:
+                    pass
+        return stats
+
+    # Các file delta mới đã đứng yên qua hai lần kiểm tra, theo thứ tự tên
+    def _stable_deltas(self):
+        stable = []
+        for name, stat in sorted(self._delta_stats().items()):
+            if self._delta_seen.get(name) == stat:
+                self._delta_done.add(name)
+                stable.append(name)
+            else:
+                self._delta_seen[name] = stat
+        return stable
+
+    # File delta lỗi (sai cột, Student_ID trùng nhau hoặc đã có trong snapshot ...) được bỏ
+    # qua, không thử lại
+    def _read(self, name, snapshot):
+        try:
+            delta = self.read_delta(os.path.join(self.delta_dir, name))
+            self._check_ids(snapshot, delta)
+            return delta
+        except Exception:
+            logger.exception("Could not append %s", name)
+            return None
+
+    def _check_ids(self, snapshot, delta):
+        if self.known_ids is None:
+            return
+        ids = self.known_ids(snapshot, delta)
+        if len(ids):
+            raise ValueError(f"{len(ids)} Student_ID đã có trong dữ liệu: {', '.join(map(str, ids[:5]))}")
+
+
+# Thread nền chỉ giữ weakref tới manager: khi manager bị bỏ (st.cache_resource.clear()),
+# thread tự dừng
+def _watch(manager_ref, poll_interval):
+    while True:
+        time.sleep(poll_interval)
+        manager = manager_ref()
+        if manager is None:
+            return
+        try:
+            manager.check()
+        except Exception:  # giữ phiên bản cũ
+            logger.exception("Could not reload %s", manager.path)
+        del manager
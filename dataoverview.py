@@ -1,12 +1,8 @@
-import pandas as pd
 import streamlit as st
+from dataset import load_data
 
 
 # Load dataset
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx")
-
 df = load_data()
 
 
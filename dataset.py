@@ -0,0 +1,321 @@
+import os
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import sql_backend
+import warmup
+from age_prefix import AgePrefix
+from cube import CUBE_DIMS, CUBE_MEASURES, PROMOTION_DIMS, PROMOTION_MEASURES, append_rows, build_cube
+from data_cache import load_columnar, load_parquet, read_source
+from data_manager import DataManager
+from figure_cache import FigureCache
+from filter_index import FilterIndex
+from mean_table import MeanTable
+from perf import timed
+from sample import build_sample_cube, stratified_sample
+from trendline import TrendlineStats, gpa_groups
+
+DATA_FILE = "education_career_success.xlsx"
+
+# "pandas" (mặc định): nạp cả frame vào RAM. "duckdb": cube và promotion_cube được tính bằng
+# một câu GROUP BY trên bản Parquet qua sql_backend, nên các trang chỉ dùng cube (graphtab,
+# stackedbarchart, line, linechart) không nạp frame
+DATA_BACKEND = os.environ.get("DATA_BACKEND", "pandas")
+
+# Thư mục chứa các file delta (.csv/.parquet, cùng cột với DATA_FILE, chỉ có Student_ID mới);
+# file thả vào đây được nối vào dữ liệu đang chạy mà không phải đọc lại DATA_FILE
+DELTA_DIR = os.environ.get("DELTA_DIR", "deltas")
+
+# Từ số dòng này trở lên, lần nạp đầu các biểu đồ % và Job_Offers hiển thị trước kết quả xấp xỉ
+# từ mẫu phân tầng (sample.py) trong lúc cube chính xác được dựng trong thread nền
+APPROX_MIN_ROWS = int(os.environ.get("APPROX_MIN_ROWS", 1_000_000))
+
+# WARMUP=0 tắt việc dựng sẵn figure cho mọi tổ hợp bộ lọc (warmup.py) khi nạp dữ liệu
+WARMUP = os.environ.get("WARMUP", "1") != "0"
+
+# Kiểu dữ liệu của từng cột – chỉ khai báo ở đây, các trang không tự ép kiểu.
+# Cột chữ ít giá trị là category (Job Level có thứ tự Entry < Mid < Senior < Executive),
+# cột số nhỏ dùng int8/int16/int32/float32 theo miền giá trị của dữ liệu.
+JOB_LEVELS = ["Entry", "Mid", "Senior", "Executive"]
+
+SCHEMA = {
+    "Student_ID": str,
+    "Age": "int8",
+    "Gender": pd.CategoricalDtype(["Female", "Male", "Other"]),
+    "High_School_GPA": "float32",
+    "SAT_Score": "int16",
+    "University_Ranking": "int16",
+    "University_GPA": "float32",
+    "Field_of_Study": pd.CategoricalDtype(
+        ["Arts", "Business", "Computer Science", "Engineering", "Law", "Mathematics", "Medicine"]
+    ),
+    "Internships_Completed": "int8",
+    "Projects_Completed": "int8",
+    "Certifications": "int8",
+    "Soft_Skills_Score": "int8",
+    "Networking_Score": "int8",
+    "Job_Offers": "int8",
+    "Starting_Salary": "int32",
+    "Career_Satisfaction": "int8",
+    "Years_to_Promotion": "int8",
+    "Current_Job_Level": pd.CategoricalDtype(JOB_LEVELS, ordered=True),
+    "Work_Life_Balance": "int8",
+    "Entrepreneurship": pd.CategoricalDtype(["No", "Yes"]),
+}
+
+
+# Kiểu khi đọc file: cột category đọc thành chuỗi, để apply_schema còn thấy giá trị gốc
+READ_SCHEMA = {
+    column: str if isinstance(dtype, pd.CategoricalDtype) else dtype for column, dtype in SCHEMA.items()
+}
+
+
+# Giá trị không có trong danh mục của cột category sẽ thành NaN khi ép kiểu, nên được báo lỗi
+# (trên giá trị gốc, trước khi ép) thay vì mất dữ liệu trong im lặng
+def check_categories(df, columns=SCHEMA):
+    for column in columns:
+        dtype = SCHEMA[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            unknown = df[column].notna() & ~df[column].isin(dtype.categories)
+            if unknown.any():
+                values = sorted(set(df[column][unknown].astype(str)))
+                raise ValueError(f"Cột {column} có giá trị ngoài danh mục của SCHEMA: {values}")
+
+
+# Ép kiểu theo SCHEMA, sau khi kiểm tra danh mục của các cột category
+def apply_schema(df):
+    check_categories(df)
+    return df.astype(SCHEMA)
+
+# Frame dùng chung giữa các session nên phải là read-only: với Copy-on-Write,
+# mọi thao tác ghi trên frame con sẽ tự copy thay vì sửa bản dùng chung.
+# (pandas >= 3 luôn bật Copy-on-Write)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+
+def _require_data_file():
+    if not os.path.exists(DATA_FILE):
+        st.error(f"❌ File '{DATA_FILE}' không tồn tại. Vui lòng upload đúng file.")
+        st.stop()
+
+
+# Thanh tiến trình khi phải parse file gốc trong lần chạy script (lần nạp đầu tiên);
+# được xóa khi đọc xong. Khi dựng lại trong thread nền thì không có thanh tiến trình.
+@contextmanager
+def _progress_bar():
+    if get_script_run_ctx(suppress_warning=True) is None:
+        yield None
+        return
+    bar = None
+
+    def progress(done, total):
+        nonlocal bar
+        if bar is None:
+            bar = st.progress(0.0)
+        text = f"Đang đọc {DATA_FILE}: {done:,} / {total:,} dòng" if total else f"Đang đọc {DATA_FILE}: {done:,} dòng"
+        bar.progress(min(done / total, 1.0) if total else 0.0, text=text)
+
+    try:
+        yield progress
+    finally:
+        if bar is not None:
+            bar.empty()
+
+
+# Một file delta thành DataFrame đúng cột và kiểu của SCHEMA. Cột category được đọc thành chuỗi
+# và kiểm tra trong apply_schema: giá trị ngoài danh mục làm cả file bị từ chối (data manager ghi
+# log, không nối) thay vì thành ô NaN trong cube
+def read_delta(path):
+    delta = read_source(path, dtype=READ_SCHEMA)
+    missing = set(SCHEMA) - set(delta.columns)
+    if missing:
+        raise ValueError(f"{path}: thiếu cột {sorted(missing)}")
+    delta = apply_schema(delta[list(SCHEMA)])
+    if delta["Student_ID"].duplicated().any():
+        raise ValueError(f"{path}: Student_ID bị trùng")
+    return delta
+
+
+# Các Student_ID của delta đã có trong dữ liệu của snapshot (file gốc + các delta đã nối):
+# hỏi DuckDB khi dùng backend SQL, ngược lại tra trong frame
+def known_ids(snapshot, delta):
+    backend = snapshot.get("backend")
+    if backend is not None:
+        return backend.known_ids(delta["Student_ID"])
+    ids = delta["Student_ID"]
+    return ids[ids.isin(snapshot.get("frame")["Student_ID"])].tolist()
+
+
+# Các phần dẫn xuất của một phiên bản dữ liệu (data_manager.Snapshot), dựng lười khi được
+# dùng lần đầu. Khi file dữ liệu đổi, data manager dựng lại trong thread nền đúng các phần
+# đã được dùng rồi mới đổi sang phiên bản mới.
+def _build_frame(snapshot):
+    with _progress_bar() as progress:
+        # Bản cache đã qua apply_schema khi ghi; đọc lại vẫn kiểm tra và đưa category về đúng SCHEMA
+        df = load_columnar(
+            snapshot.path, dtype=READ_SCHEMA, progress=progress, convert=apply_schema, digest=snapshot.digest
+        )
+    df = apply_schema(df)
+    if snapshot.deltas:
+        df = pd.concat([df, *snapshot.deltas], ignore_index=True)
+    return df
+
+
+def _build_backend(snapshot):
+    if DATA_BACKEND != "duckdb" or not sql_backend.available():
+        return None
+    with _progress_bar() as progress:
+        path = load_parquet(snapshot.path, dtype=READ_SCHEMA, progress=progress, digest=snapshot.digest)
+    return sql_backend.SqlBackend(path, deltas=snapshot.deltas)
+
+
+# Với backend SQL, cube là một câu GROUP BY trên Parquet và frame đầy đủ không bao giờ được nạp.
+# DuckDB sắp các chiều chữ theo bảng chữ cái, nên sắp lại theo thứ tự category như groupby.
+def _cube_builder(dims, measures):
+    def build(snapshot):
+        backend = snapshot.get("backend")
+        if backend is not None:
+            cube = backend.cube(dims, measures)
+            check_categories(cube, dims)
+            cube = cube.astype({dim: SCHEMA[dim] for dim in dims})
+            return cube.sort_values(dims, kind="stable", ignore_index=True)
+        return build_cube(snapshot.get("frame"), dims, measures)
+    return build
+
+
+# Cache đủ chỗ cho mọi figure làm nóng (~600) cộng các khoảng tuổi người dùng tự chọn
+def _build_figures(snapshot):
+    figures = FigureCache(maxsize=2048)
+    if WARMUP:
+        warmup.start(snapshot, figures)
+    return figures
+
+
+def _build_trendline(snapshot):
+    df = snapshot.get("frame")
+    return TrendlineStats(df["University_GPA"], df["Starting_Salary"], gpa_groups(df["University_GPA"]))
+
+
+BUILDERS = {
+    "frame": _build_frame,
+    "backend": _build_backend,
+    "cube": _cube_builder(CUBE_DIMS, CUBE_MEASURES),
+    "promotion_cube": _cube_builder(PROMOTION_DIMS, PROMOTION_MEASURES),
+    "sample_cube": lambda snapshot: build_sample_cube(stratified_sample(snapshot.get("frame"))),
+    "age_prefix": lambda snapshot: AgePrefix(snapshot.get("cube")),
+    "balance_by_age": lambda snapshot: MeanTable(
+        snapshot.get("cube"), "Current_Job_Level", "Age", "Work_Life_Balance"
+    ),
+    "balance_by_promotion": lambda snapshot: MeanTable(
+        snapshot.get("promotion_cube"), "Current_Job_Level", "Years_to_Promotion", "Work_Life_Balance"
+    ),
+    "index": lambda snapshot: FilterIndex(snapshot.get("frame")),
+    "trendline": _build_trendline,
+    "figures": _build_figures,
+}
+
+# Cập nhật khi nối một delta: các cube tốn thời gian theo kích thước delta (và số ô của cube);
+# frame phải copy một lần. index, trendline, age_prefix, balance_by_*, backend và figure cache
+# (nếu phiên bản cũ đã dùng) được dựng lại từ các phần đã cập nhật trước khi đổi phiên bản.
+APPENDERS = {
+    "frame": lambda df, delta: pd.concat([df, delta], ignore_index=True),
+    "cube": lambda cube, delta: append_rows(cube, delta, CUBE_DIMS, CUBE_MEASURES),
+    "promotion_cube": lambda cube, delta: append_rows(cube, delta, PROMOTION_DIMS, PROMOTION_MEASURES),
+}
+
+
+# Một data manager cho cả process, theo dõi DATA_FILE và giữ phiên bản dữ liệu hiện tại
+@st.cache_resource(show_spinner=False)
+def load_manager():
+    _require_data_file()
+    if DATA_BACKEND == "duckdb" and not sql_backend.available():
+        st.warning("DATA_BACKEND=duckdb nhưng chưa cài duckdb (pip install duckdb), dùng pandas.")
+    manager = DataManager(
+        DATA_FILE, BUILDERS, APPENDERS, delta_dir=DELTA_DIR, read_delta=read_delta, known_ids=known_ids
+    )
+    # Figure cache (và việc làm nóng nó) bắt đầu ngay khi dữ liệu nạp, trước khi trang nào cần
+    manager.current().prefetch("figures")
+    return manager
+
+
+# Một bản duy nhất cho cả process (theo phiên bản dữ liệu): các trang nhận đúng object dùng
+# chung, không pickle/copy như st.cache_data. Các trang KHÔNG được sửa frame tại chỗ
+# (gán cột mới, inplace=True...), hãy dùng df.assign(...) hoặc lọc ra frame mới.
+# Lần đầu (chưa có cache columnar) file xlsx được đọc streaming theo chunk, có thanh tiến trình.
+@timed('load')
+def load_data():
+    return load_manager().current().get("frame")
+
+
+# Cube đếm/tổng theo các chiều lọc
+@timed('load')
+def load_cube():
+    return load_manager().current().get("cube")
+
+
+# (cube, exact): cube chính xác nếu đã có; nếu chưa và dữ liệu lớn thì cube xem trước từ mẫu
+# (exact = False, có Sample_Count và *_sumsq cho khoảng tin cậy) và cube chính xác được dựng
+# trong thread nền. Trang đang xem trước gọi rerun_when_exact() ở cuối.
+@timed('load')
+def load_cube_preview():
+    snapshot = load_manager().current()
+    if snapshot.ready("cube") or snapshot.get("backend") is not None:
+        return snapshot.get("cube"), True
+    if len(snapshot.get("frame")) < APPROX_MIN_ROWS:
+        return snapshot.get("cube"), True
+    snapshot.prefetch("cube")
+    return snapshot.get("sample_cube"), False
+
+
+# Kiểm tra mỗi giây (fragment, không chạy lại cả trang); khi cube chính xác đã xong thì chạy
+# lại cả trang để thay kết quả xem trước
+def rerun_when_exact():
+    @st.fragment(run_every=1.0)
+    def poll():
+        snapshot = load_manager().current()
+        snapshot.prefetch("cube")  # phiên bản dữ liệu có thể vừa đổi
+        if snapshot.ready("cube"):
+            st.rerun()
+    poll()
+
+
+# Tổng cộng dồn theo Age của cube chính xác (age_prefix.py): dùng thay cho cube trong slice_cube,
+# khoảng tuổi nào cũng chỉ là hiệu của hai giá trị cộng dồn
+@timed('load')
+def load_age_prefix():
+    return load_manager().current().get("age_prefix")
+
+
+# Bảng (count, sum, sum of squares) của Work_Life_Balance theo Job Level × Age (line.py) và
+# Job Level × Years_to_Promotion (linechart.py)
+@timed('load')
+def load_balance_by_age():
+    return load_manager().current().get("balance_by_age")
+
+
+@timed('load')
+def load_balance_by_promotion():
+    return load_manager().current().get("balance_by_promotion")
+
+
+# Bitmap cho từng giá trị của các cột lọc
+@timed('load')
+def load_index():
+    return load_manager().current().get("index")
+
+
+# Thống kê đủ cho đường hồi quy GPA ~ Starting Salary của scatter.py
+@timed('load')
+def load_trendline():
+    return load_manager().current().get("trendline")
+
+
+# Cache JSON figure theo tổ hợp bộ lọc, dùng chung cho mọi session; mỗi phiên bản dữ liệu
+# một cache riêng nên không bao giờ trả figure của dữ liệu cũ
+@timed('load')
+def load_figure_cache():
+    return load_manager().current().get("figures")
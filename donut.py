@@ -1,84 +1,68 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from scipy.stats import gaussian_kde
 import numpy as np
+import figure_spec as fs
+from cube import slice_cube, value_counts
+from dataset import load_age_prefix, load_cube
+import payload
+import perf_panel
+from density import age_density_by
 
 st.set_page_config(layout="wide")
+perf_panel.start(__file__)
 
 # Load and preprocess data
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx")
-
-df = load_data()
-df = df[df['Entrepreneurship'].isin(['Yes', 'No'])]
+cube = load_cube()
+cube = slice_cube(cube, statuses=['Yes', 'No'])
 
 # Sidebar filters
 st.sidebar.title("Filters")
 
 # Dropdown Job Level
-job_levels = sorted(df['Current_Job_Level'].dropna().unique())
+job_levels = sorted(cube['Current_Job_Level'].dropna().unique())
 selected_level = st.sidebar.selectbox("Select Job Level", job_levels)
 
 # Age range slider
-min_age, max_age = int(df['Age'].min()), int(df['Age'].max())
+min_age, max_age = int(cube['Age'].min()), int(cube['Age'].max())
 age_range = st.sidebar.slider("Select Age Range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
 
 # Dropdown for Entrepreneurship status
 status_options = ['All', 'Yes', 'No']
 selected_status = st.sidebar.selectbox("Select Entrepreneurship Status", status_options)
 
-# Filter data based on selections
-filtered_df = df[df['Current_Job_Level'] == selected_level]
-filtered_df = filtered_df[filtered_df['Age'].between(age_range[0], age_range[1])]
-
-if selected_status != 'All':
-    filtered_df = filtered_df[filtered_df['Entrepreneurship'] == selected_status]
+# Filter data based on selections: khoảng tuổi lấy từ tổng cộng dồn theo Age (age_prefix.py)
+statuses = ['Yes', 'No'] if selected_status == 'All' else [selected_status]
+filtered_cube = slice_cube(load_age_prefix(), level=selected_level, age_range=age_range, statuses=statuses)
 
 # Select variable to visualize
 chart_option = st.selectbox("Select Variable for Visualization", ['Gender', 'Field of Study'])
 
 # Check if enough data exists
-if filtered_df.empty:
+if filtered_cube.empty:
     st.write("Not enough data to display charts.")
 else:
     col1, col2 = st.columns([1, 1]) 
 
     # ----- DENSITY CHART (Area) -----
     with col1:
-        fig_density = go.Figure()
-
         if chart_option == 'Gender':
-            categories = filtered_df['Gender'].unique()
             title = "Age Distribution by Gender (Area Chart)"
             group_col = 'Gender'
 
         elif chart_option == 'Field of Study':
-            categories = filtered_df['Field_of_Study'].dropna().unique()
             title = "Age Distribution by Field of Study"
             group_col = 'Field_of_Study'
 
-        for cat in categories:
-            age_data = filtered_df[filtered_df[group_col] == cat]['Age']
-
-            if len(age_data) > 1:
-                kde = gaussian_kde(age_data)
-                x_vals = np.linspace(age_range[0], age_range[1], 100)
-                y_vals = kde(x_vals)
-
-                fig_density.add_trace(go.Scatter(
-                    x=x_vals,
-                    y=y_vals,
-                    mode='lines',
-                    name=str(cat),
-                    fill='tozeroy'
-                ))
-
-        fig_density.update_layout(
-            title=title,
-            xaxis_title="Age",
-            yaxis_title="Density",
+        # Ghép spec thẳng từ dict (figure_spec.py), không qua validator của go.Scatter
+        x_vals = np.linspace(age_range[0], age_range[1], 100)
+        density_traces = [
+            fs.scatter(x_vals, y_vals, mode='lines', name=str(cat), fill='tozeroy')
+            for cat, y_vals in age_density_by(filtered_cube, group_col, x_vals)
+        ]
+
+        fig_density = fs.figure(density_traces, dict(
+            title=fs.title(title),
+            xaxis=dict(title=fs.title("Age")),
+            yaxis=dict(title=fs.title("Density")),
             height=500,
             margin=dict(t=40, l=40, r=40, b=80),  # tăng b để chừa chỗ cho legend bên dưới
             legend=dict(
@@ -88,36 +72,31 @@ else:
                 xanchor="center",
                 x=0.5
             )
-        )
-        st.plotly_chart(fig_density, use_container_width=True)
+        ))
+        perf_panel.plotly_chart(payload.encode(fig_density), use_container_width=True)
 
 
     # ----- DONUT CHART -----
     with col2:
         if chart_option == 'Gender':
-            gender_counts = filtered_df['Gender'].value_counts().reset_index()
-            gender_counts.columns = ['Gender', 'Count']
-            fig_donut = go.Figure(data=[go.Pie(
-                labels=gender_counts['Gender'],
-                values=gender_counts['Count'],
-                hole=0.5
-            )])
-            fig_donut.update_layout(title="Gender Distribution (Donut Chart)")
+            donut_title = "Gender Distribution (Donut Chart)"
+            group_col = 'Gender'
 
         elif chart_option == 'Field of Study':
-            field_counts = filtered_df['Field_of_Study'].value_counts().reset_index()
-            field_counts.columns = ['Field of Study', 'Count']
-            fig_donut = go.Figure(data=[go.Pie(
-                labels=field_counts['Field of Study'],
-                values=field_counts['Count'],
-                hole=0.5
-            )])
-            fig_donut.update_layout(title="Field of Study Distribution (Donut Chart)")
-
-        fig_donut.update_layout(
-            height=350,
-            margin=dict(t=40, l=40, r=40, b=40),
-            showlegend=True
+            donut_title = "Field of Study Distribution (Donut Chart)"
+            group_col = 'Field_of_Study'
+
+        counts = value_counts(filtered_cube, group_col)
+        fig_donut = fs.figure(
+            [fs.pie(counts[group_col], counts['Count'], hole=0.5)],
+            dict(
+                title=fs.title(donut_title),
+                height=350,
+                margin=dict(t=40, l=40, r=40, b=40),
+                showlegend=True
+            )
         )
-        st.plotly_chart(fig_donut, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_donut), use_container_width=True)
         
+
+perf_panel.finish()
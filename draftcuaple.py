@@ -1,44 +1,45 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from scipy.stats import gaussian_kde
+from cube import mean_by, percentage_by_age, slice_cube, value_counts
+from dataset import load_cube_preview, rerun_when_exact
+import payload
+import perf_panel
+from density import age_density_by
+from sample import mean_by_ci, percentage_by_age_ci
 
 # PAGE CONFIG
 st.set_page_config(page_title="Education & Career Insights", layout="wide", page_icon="📊")
+perf_panel.start(__file__)
 
-# Load data
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx")
-
-df = load_data()
+# Load data (exact = False: xem trước từ mẫu phân tầng trong lúc cube chính xác đang được dựng)
+cube, exact = load_cube_preview()
 
 # SIDEBAR FILTERS
 st.sidebar.title("Filters")
 
 # Gender filter
-gender_options = ['All'] + sorted(df['Gender'].dropna().unique())
+gender_options = ['All'] + sorted(cube['Gender'].dropna().unique())
 selected_gender = st.sidebar.selectbox("Select Gender", gender_options)
 if selected_gender != 'All':
-    df = df[df['Gender'] == selected_gender]
+    cube = slice_cube(cube, genders=[selected_gender])
 
 # Job Level
-job_levels = sorted(df['Current_Job_Level'].dropna().unique())
+job_levels = sorted(cube['Current_Job_Level'].dropna().unique())
 selected_level = st.sidebar.selectbox("Select Job Level", job_levels)
-df = df[df['Current_Job_Level'] == selected_level]
+cube = slice_cube(cube, level=selected_level)
 
 # Age Range
-min_age, max_age = int(df['Age'].min()), int(df['Age'].max())
+min_age, max_age = int(cube['Age'].min()), int(cube['Age'].max())
 age_range = st.sidebar.slider("Select Age Range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
-df = df[df['Age'].between(age_range[0], age_range[1])]
+cube = slice_cube(cube, age_range=age_range)
 
 # Entrepreneurship
 entrepreneur_options = ['All', 'Yes', 'No']
 selected_status = st.sidebar.selectbox("Select Entrepreneurship Status", entrepreneur_options)
 selected_statuses = ['Yes', 'No'] if selected_status == 'All' else [selected_status]
-df = df[df['Entrepreneurship'].isin(selected_statuses)]
+cube = slice_cube(cube, statuses=selected_statuses)
 
 # MAIN PAGE
 st.title("📊 Career and Education Insights")
@@ -49,15 +50,12 @@ tab1, tab2 = st.tabs(["Entrepreneurship & Job Offers", "Demographics Visualizati
 # -------- TAB 1 -------- #
 with tab1:
     st.subheader("Entrepreneurship and Job Offers by Age")
+    if not exact:
+        st.info("⏳ Preview from a stratified sample, error bars show 95% confidence intervals. "
+                "Exact results will replace it as soon as they are ready.")
 
     # Grouped data for bar chart
-    df_grouped = (
-        df.groupby(['Current_Job_Level', 'Age', 'Entrepreneurship'])
-        .size()
-        .reset_index(name='Count')
-    )
-    df_grouped['Percentage'] = df_grouped.groupby(['Current_Job_Level', 'Age'])['Count'].transform(lambda x: x / x.sum())
-    df_bar = df_grouped
+    df_bar = percentage_by_age(cube) if exact else percentage_by_age_ci(cube)
 
     even_ages = sorted(df_bar['Age'].unique())
     even_ages = [age for age in even_ages if age % 2 == 0]
@@ -72,14 +70,15 @@ with tab1:
         color_discrete_map=color_map,
         category_orders={'Entrepreneurship': ['No', 'Yes']},
         labels={'Age': 'Age', 'Percentage': 'Percentage'},
+        error_y=None if exact else 'CI',
         height=450,
         width=1250,
         title=f"Entrepreneurship Distribution by Age – {selected_level} Level"
     )
-    fig_bar.update_traces(
-        hovertemplate="Entrepreneurship=%{customdata[0]}<br>Age=%{x}<br>Percentage=%{y:.0%}<extra></extra>",
-        customdata=df_bar[['Entrepreneurship']].values
-    )
+    # Mỗi trace là một trạng thái: ghi tên trạng thái vào hovertemplate thay cho customdata
+    fig_bar.for_each_trace(lambda trace: trace.update(
+        hovertemplate=f"Entrepreneurship={trace.name}<br>Age=%{{x}}<br>Percentage=%{{y:.0%}}<extra></extra>"
+    ))
     fig_bar.update_layout(
         margin=dict(t=40, l=40, r=40, b=40),
         xaxis=dict(tickvals=even_ages),
@@ -88,7 +87,10 @@ with tab1:
     )
 
     # Line chart: Average Job Offers
-    df_avg = df.groupby(['Age', 'Entrepreneurship'])['Job_Offers'].mean().reset_index()
+    if exact:
+        df_avg = mean_by(cube, ['Age', 'Entrepreneurship'], 'Job_Offers')
+    else:
+        df_avg = mean_by_ci(cube, ['Age', 'Entrepreneurship'], 'Job_Offers')
 
     fig_line = go.Figure()
     for status in selected_statuses:
@@ -100,6 +102,7 @@ with tab1:
             name=status,
             line=dict(color=color_map[status], width=2),
             marker=dict(size=6),
+            error_y=None if exact else dict(type='data', array=temp['CI']),
             hovertemplate="%{y:.2f}"
         ))
     fig_line.update_layout(
@@ -113,43 +116,46 @@ with tab1:
 
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(fig_bar, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_bar), use_container_width=True)
     with col2:
-        st.plotly_chart(fig_line, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_line), use_container_width=True)
 
 # -------- TAB 2 -------- #
-with tab2:
+# Fragment: đổi biến hiển thị chỉ chạy lại tab này; cube và khoảng tuổi được truyền vào
+@perf_panel.fragment
+def demographics_tab(cube, age_range, exact):
     st.subheader("Age Distribution & Category Proportions")
 
     chart_option = st.selectbox("Select Variable for Visualization", ['Gender', 'Field of Study'])
 
+    # Mật độ và donut không có khoảng tin cậy nên không vẽ từ cube mẫu: chờ cube chính xác
+    # (rerun_when_exact chạy lại trang)
+    if not exact:
+        st.info("⏳ Preview from a stratified sample is running. "
+                "Demographic charts will appear as soon as the exact results are ready.")
+        return
+
     col1, col2 = st.columns(2)
 
     # ----- AREA CHART -----
     with col1:
         fig_density = go.Figure()
         if chart_option == 'Gender':
-            categories = df['Gender'].dropna().unique()
             group_col = 'Gender'
             title = "Age Distribution by Gender"
         else:
-            categories = df['Field_of_Study'].dropna().unique()
             group_col = 'Field_of_Study'
             title = "Age Distribution by Field of Study"
 
-        for cat in categories:
-            age_data = df[df[group_col] == cat]['Age']
-            if len(age_data) > 1:
-                kde = gaussian_kde(age_data)
-                x_vals = np.linspace(age_range[0], age_range[1], 100)
-                y_vals = kde(x_vals)
-                fig_density.add_trace(go.Scatter(
-                    x=x_vals,
-                    y=y_vals,
-                    mode='lines',
-                    name=str(cat),
-                    fill='tozeroy'
-                ))
+        x_vals = np.linspace(age_range[0], age_range[1], 100)
+        for cat, y_vals in age_density_by(cube, group_col, x_vals):
+            fig_density.add_trace(go.Scatter(
+                x=x_vals,
+                y=y_vals,
+                mode='lines',
+                name=str(cat),
+                fill='tozeroy'
+            ))
 
         fig_density.update_layout(
             title=title,
@@ -159,22 +165,14 @@ with tab2:
             margin=dict(t=40, l=40, r=40, b=80),
             legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
         )
-        st.plotly_chart(fig_density, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_density), use_container_width=True)
 
     # ----- DONUT CHART -----
     with col2:
-        if chart_option == 'Gender':
-            counts = df['Gender'].value_counts().reset_index()
-            counts.columns = ['Gender', 'Count']
-            labels = counts['Gender']
-            values = counts['Count']
-            title = "Gender Distribution"
-        else:
-            counts = df['Field_of_Study'].value_counts().reset_index()
-            counts.columns = ['Field of Study', 'Count']
-            labels = counts['Field of Study']
-            values = counts['Count']
-            title = "Field of Study Distribution"
+        counts = value_counts(cube, group_col)
+        labels = counts[group_col]
+        values = counts['Count']
+        title = f"{chart_option} Distribution"
 
         fig_donut = go.Figure(data=[go.Pie(labels=labels, values=values, hole=0.5)])
         fig_donut.update_layout(
@@ -183,4 +181,13 @@ with tab2:
             margin=dict(t=40, l=40, r=40, b=40),
             legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
         )
-        st.plotly_chart(fig_donut, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_donut), use_container_width=True)
+
+
+with tab2:
+    demographics_tab(cube, age_range, exact)
+
+if not exact:
+    rerun_when_exact()
+
+perf_panel.finish()
@@ -0,0 +1,95 @@
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+import payload
+from perf import current_run, timed
+
+
+# 'All', chọn đủ mọi giá trị, hoặc không chọn gì đều có nghĩa "không lọc" -> None;
+# còn lại là tuple đã sắp xếp, để cùng một lựa chọn luôn ra cùng một key
+def canonical_selection(selected, all_values):
+    values = set(selected) - {'All'}
+    if 'All' in selected or not values or values >= set(all_values):
+        return None
+    return tuple(sorted(values))
+
+
+def chart_key(chart, **filters):
+    return (chart,) + tuple(sorted(filters.items()))
+
+
+# JSON của figure cho từng tổ hợp bộ lọc, dùng chung cho mọi session trong process.
+# Giới hạn maxsize, bỏ bớt mục lâu không dùng nhất (LRU), có đếm hit/miss.
+class FigureCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            hit = key in self._items
+            if hit:
+                self._items.move_to_end(key)
+                self.hits += 1
+                value = self._items[key]
+            else:
+                self.misses += 1
+        if hit:
+            self._count('hits')
+            return value
+
+        # Dựng figure ngoài lock để các session khác không phải chờ
+        value = build()
+        self.put(key, value)
+        self._count('misses')
+        return value
+
+    # Thêm JSON đã dựng sẵn (warmup.py), không tính hit/miss
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def items(self):
+        with self._lock:
+            return list(self._items.items())
+
+    # build() trả về go.Figure; cache giữ JSON đã thu gọn (payload.encode) và serialize. Figure
+    # trả ra được dựng lại không qua validator vì JSON đã hợp lệ từ lần dựng đầu tiên.
+    @timed('figure')
+    def figure(self, key, build):
+        fig_json = self.get_or_build(key, lambda: payload.encode(build()).to_json())
+        return go.Figure(json.loads(fig_json), _validate=False)
+
+    # Hit/miss trong lần rerun đang đo (perf_panel: panel và log JSON), kèm stats() của cả cache
+    def _count(self, outcome):
+        run = current_run()
+        if run is not None:
+            counts = run.setdefault('figure_cache', {'hits': 0, 'misses': 0})
+            counts[outcome] += 1
+            counts['cache'] = self.stats()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
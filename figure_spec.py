@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Figure dựng thẳng từ dict, đúng spec mà plotly.express / go.Figure tạo ra, rồi bọc bằng
+# go.Figure(..., _validate=False): không chạy validator của từng thuộc tính ở mỗi add_trace,
+# update_layout, update_traces. Template mặc định vẫn được gắn như go.Figure thường và mảng
+# numpy vẫn thành typed array (bdata) khi serialize, nên JSON gửi cho trình duyệt giống hệt
+# (benchmarks/bench_figures.py kiểm tra). Chỉ dùng cho các biểu đồ có spec cố định: mọi thuộc
+# tính phải đúng tên và kiểu plotly.js vì không còn gì kiểm tra hộ.
+
+
+def figure(data, layout):
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
+
+
+# Cột dữ liệu như validator của plotly: Series / mảng thành ndarray (giữ dtype), list giữ nguyên
+def array(values):
+    if isinstance(values, (pd.Series, pd.Index)):
+        return values.to_numpy()
+    return values
+
+
+def title(text):
+    return {'text': text}
+
+
+# Trục x, y của plotly.express khi chỉ có một subplot
+def px_axes(x_title, y_title):
+    return {
+        'xaxis': {'anchor': 'y', 'domain': [0.0, 1.0], 'title': title(x_title)},
+        'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': title(y_title)},
+    }
+
+
+# Giá trị của cột màu theo thứ tự của px: trước là các giá trị trong order (có dòng), sau là
+# các giá trị còn lại theo thứ tự xuất hiện
+def _color_values(df, color, order):
+    present = list(df[color].dropna().unique())
+    return [v for v in order if v in present] + [v for v in present if v not in order]
+
+
+# Các trace của px.bar(df, x, y, color=color, color_discrete_map=color_map,
+# category_orders={color: order}, error_y=error_y); mỗi giá trị của cột màu một trace
+def px_bar_traces(df, x, y, color, order, color_map, error_y=None):
+    traces = []
+    for value in _color_values(df, color, order):
+        rows = df[df[color] == value]
+        trace = {
+            'hovertemplate': f"{color}={value}<br>{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>",
+            'legendgroup': value,
+            'marker': {'color': color_map[value], 'pattern': {'shape': ''}},
+            'name': value,
+            'orientation': 'v',
+            'showlegend': True,
+            'textposition': 'auto',
+            'x': array(rows[x]),
+            'xaxis': 'x',
+            'y': array(rows[y]),
+            'yaxis': 'y',
+            'type': 'bar',
+        }
+        if error_y is not None:
+            trace['error_y'] = {'array': array(rows[error_y])}
+        traces.append(trace)
+    return traces
+
+
+# Layout của px.bar(..., barmode='stack'): legend có tiêu đề là cột màu khi có ít nhất một trace
+def px_bar_layout(traces, x, y, color, bar_title, height=None, width=None):
+    layout = px_axes(x, y)
+    layout['legend'] = {'tracegroupgap': 0}
+    if traces:
+        layout['legend']['title'] = title(color)
+    layout.update(title=title(bar_title), barmode='stack')
+    if height is not None:
+        layout['height'] = height
+    if width is not None:
+        layout['width'] = width
+    return layout
+
+
+# Trace của px.pie(df, names=names, values=values, hole=hole)
+def px_pie_trace(df, names, values, hole):
+    return {
+        'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]},
+        'hole': hole,
+        'hovertemplate': f"{names}=%{{label}}<br>{values}=%{{value}}<extra></extra>",
+        'labels': array(df[names]),
+        'legendgroup': '',
+        'name': '',
+        'showlegend': True,
+        'values': array(df[values]),
+        'type': 'pie',
+    }
+
+
+# go.Scatter(x=x, y=y, **props)
+def scatter(x, y, **props):
+    return dict(props, x=array(x), y=array(y), type='scatter')
+
+
+# Dải y ± error quanh một đường (vd. ±1 sai số chuẩn): vùng kín tô màu nhạt, không hover, không
+# legend. Điểm không có error (NaN) thì dải co về đường.
+def error_band(x, y, error, color, opacity=0.2, **props):
+    x, y = np.asarray(array(x)), np.asarray(array(y), dtype=float)
+    error = np.nan_to_num(np.asarray(array(error), dtype=float))
+    red, green, blue = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return dict(
+        props,
+        x=np.concatenate([x, x[::-1]]),
+        y=np.concatenate([y + error, (y - error)[::-1]]),
+        fill='toself',
+        fillcolor=f"rgba({red},{green},{blue},{opacity})",
+        line={'width': 0},
+        mode='lines',
+        hoverinfo='skip',
+        showlegend=False,
+        type='scatter',
+    )
+
+
+# go.Pie(labels=labels, values=values, **props)
+def pie(labels, values, **props):
+    return dict(props, labels=array(labels), values=array(values), type='pie')
+
+
+# Trục x dùng cho tickvals: số nguyên Python (giá trị numpy không đi qua validator nữa)
+def int_list(values):
+    return [int(v) for v in np.asarray(values)]
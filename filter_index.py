@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+# Các cột có bitmap: mỗi giá trị (và mỗi tuổi) một bitmap đã packbits (1 bit / dòng)
+INDEX_COLUMNS = ['Current_Job_Level', 'Entrepreneurship', 'Gender', 'Field_of_Study', 'Age']
+
+
+class FilterIndex:
+    def __init__(self, df, columns=INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            column = df[col]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # So sánh trên mã số của category thay vì so sánh từng chuỗi
+                codes = column.cat.codes.to_numpy()
+                self.bitmaps[col] = {
+                    column.cat.categories[code]: np.packbits(codes == code)
+                    for code in pd.unique(codes[codes >= 0])
+                }
+                continue
+            values = column.to_numpy()
+            self.bitmaps[col] = {
+                value: np.packbits(values == value)
+                for value in column.dropna().unique()
+            }
+        # Cùng một bộ lọc trong một lần rerun (và giữa các session) chỉ tính một lần
+        self._select_cached = lru_cache(maxsize=128)(self._select)
+
+    # OR các bitmap của những giá trị được chọn trong một cột
+    def bitmap(self, column, values):
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in self.bitmaps[column]:
+                bits |= self.bitmaps[column][value]
+        return bits
+
+    # Vị trí các dòng thỏa mọi bộ lọc. Tham số là tên cột: list giá trị, hoặc (min, max)
+    # với Age; None = không lọc cột đó. Ví dụ select(Gender=['Male'], Age=(20, 25))
+    @timed('filter')
+    def select(self, **filters):
+        key = []
+        for column, values in sorted(filters.items()):
+            if values is None:
+                continue
+            if column == 'Age' and isinstance(values, tuple):
+                values = range(values[0], values[1] + 1)
+            key.append((column, tuple(sorted(set(values)))))
+        return self._select_cached(tuple(key))
+
+    def _select(self, key):
+        bits = np.full((self.n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for column, values in key:
+            bits &= self.bitmap(column, values)
+        rows = np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+        rows.flags.writeable = False
+        return rows
@@ -0,0 +1,196 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dataset import SCHEMA
+
+# Tạo dữ liệu giả cùng 20 cột, khoảng giá trị và nhóm giá trị như mô tả trong dataoverview.py,
+# để thử các trang với 1M–50M dòng:
+#
+#   python generate_data.py --rows 1000000 --out data_1m.parquet --seed 7
+#   python generate_data.py --rows 1000000 --out data_1m.xlsx
+#
+# Dữ liệu được tạo theo từng chunk song song trên nhiều core. Chunk thứ i dùng seed
+# SeedSequence(seed, spawn_key=(i,)) nên cùng seed + chunk size luôn ra cùng một file,
+# không phụ thuộc số worker.
+CHUNK_SIZE = 250_000
+XLSX_MAX_ROWS = 1_048_575  # sheet xlsx tối đa 1,048,576 dòng, trừ dòng tiêu đề
+
+GENDERS = (['Male', 'Female', 'Other'], [0.49, 0.47, 0.04])
+FIELDS = ['Arts', 'Law', 'Business', 'Medicine', 'Computer Science', 'Engineering', 'Mathematics']
+JOB_LEVELS = (['Entry', 'Mid', 'Senior', 'Executive'], [0.49, 0.31, 0.155, 0.045])
+ENTREPRENEUR_SHARE = 0.2
+SALARY_MEAN, SALARY_STD = 50_500, 14_500
+
+
+# Biến ẩn chuẩn hóa: tổ hợp các biến khác với trọng số cho trước + nhiễu, phương sai 1
+def _latent(rng, n, *terms):
+    noise = np.sqrt(max(1 - sum(w * w for w, _ in terms), 0))
+    return sum(w * z for w, z in terms) + noise * rng.standard_normal(n)
+
+
+# Đưa biến ẩn về phân phối đều trên [lo, hi] theo thứ hạng trong chunk: giữ tương quan
+# thứ hạng với biến ẩn, còn phân phối biên vẫn đều như dữ liệu gốc
+def _uniform(z, lo, hi, decimals=None):
+    u = (np.argsort(np.argsort(z)) + 0.5) / len(z)
+    if decimals is None:
+        return (lo + np.floor(u * (hi - lo + 1))).astype(np.int64)
+    return np.round(lo + u * (hi - lo), decimals)
+
+
+def _categories(z, values, probs):
+    u = (np.argsort(np.argsort(z)) + 0.5) / len(z)
+    return np.asarray(values, dtype=object)[np.searchsorted(np.cumsum(probs), u)]
+
+
+def _standardize(x):
+    return (x - x.mean()) / (x.std() or 1)
+
+
+# Một chunk dòng start .. start + n_rows - 1, cột và kiểu theo dataset.SCHEMA
+def generate_chunk(seed, index, start, n_rows, id_width=5):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    n = n_rows
+    ability = rng.standard_normal(n)
+    experience = rng.standard_normal(n)
+    social = rng.standard_normal(n)
+
+    age = rng.integers(18, 30, n)
+    high_school_gpa = _uniform(_latent(rng, n, (0.6, ability)), 2.0, 4.0, 2)
+    university_gpa = _uniform(_latent(rng, n, (0.7, ability)), 2.0, 4.0, 2)
+    internships = _uniform(_latent(rng, n, (0.5, experience)), 0, 4)
+    networking = _uniform(_latent(rng, n, (0.6, social)), 1, 10)
+
+    # Lương khởi điểm: GPA đại học, thực tập và networking càng cao thì lương càng cao
+    salary_z = _latent(
+        rng, n,
+        (0.35, _standardize(university_gpa)),
+        (0.2, _standardize(internships)),
+        (0.15, _standardize(networking)),
+    )
+    salary = np.clip(np.round((SALARY_MEAN + SALARY_STD * salary_z) / 100) * 100, 25_000, 150_000)
+
+    # Người lớn tuổi và lương cao thường ở cấp bậc cao hơn
+    level_z = _latent(rng, n, (0.3, _standardize(age)), (0.3, salary_z))
+
+    frame = pd.DataFrame({
+        'Student_ID': 'S' + pd.Series(np.arange(start + 1, start + n + 1)).astype(str).str.zfill(id_width),
+        'Age': age,
+        'Gender': rng.choice(GENDERS[0], n, p=GENDERS[1]),
+        'High_School_GPA': high_school_gpa,
+        'SAT_Score': _uniform(_latent(rng, n, (0.5, ability)), 900, 1600),
+        # Hạng 1 là trường tốt nhất
+        'University_Ranking': _uniform(_latent(rng, n, (-0.35, ability)), 1, 1000),
+        'University_GPA': university_gpa,
+        'Field_of_Study': rng.choice(FIELDS, n),
+        'Internships_Completed': internships,
+        'Projects_Completed': _uniform(_latent(rng, n, (0.4, experience)), 0, 9),
+        'Certifications': _uniform(_latent(rng, n, (0.3, experience)), 0, 5),
+        'Soft_Skills_Score': _uniform(_latent(rng, n, (0.4, social)), 1, 10),
+        'Networking_Score': networking,
+        'Job_Offers': _uniform(_latent(rng, n, (0.3, _standardize(internships)), (0.3, _standardize(networking))), 0, 5),
+        'Starting_Salary': salary,
+        'Career_Satisfaction': _uniform(_latent(rng, n, (0.2, salary_z)), 1, 10),
+        'Years_to_Promotion': _uniform(_latent(rng, n, (-0.2, social)), 1, 5),
+        'Current_Job_Level': _categories(level_z, *JOB_LEVELS),
+        'Work_Life_Balance': _uniform(_latent(rng, n, (-0.15, level_z)), 1, 10),
+        'Entrepreneurship': np.where(rng.random(n) < ENTREPRENEUR_SHARE, 'Yes', 'No'),
+    })
+    return frame[list(SCHEMA)].astype(SCHEMA)
+
+
+def _chunk_args(n_rows, seed, chunk_size):
+    id_width = max(5, len(str(n_rows)))
+    return [
+        (seed, i, start, min(chunk_size, n_rows - start), id_width)
+        for i, start in enumerate(range(0, n_rows, chunk_size))
+    ]
+
+
+def _build(args):
+    return generate_chunk(*args)
+
+
+def _build_csv(args):
+    return _build(args).to_csv(index=False, header=args[1] == 0)
+
+
+# Các chunk theo đúng thứ tự dòng, được tạo song song trong process pool
+def generate(n_rows, seed=0, chunk_size=CHUNK_SIZE, workers=None, build=_build):
+    tasks = _chunk_args(n_rows, seed, chunk_size)
+    if workers == 1 or len(tasks) == 1:
+        yield from map(build, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(build, tasks)
+
+
+def write_csv(path, n_rows, **options):
+    # Worker tự format CSV, process chính chỉ ghi nối tiếp
+    with open(path, 'w', newline='') as f:
+        for text in generate(n_rows, build=_build_csv, **options):
+            f.write(text)
+
+
+def write_parquet(path, n_rows, **options):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for frame in generate(n_rows, **options):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)  # mỗi chunk một row group
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_xlsx(path, n_rows, **options):
+    from openpyxl import Workbook
+
+    if n_rows > XLSX_MAX_ROWS:
+        raise ValueError(f"xlsx chỉ chứa được tối đa {XLSX_MAX_ROWS:,} dòng, dùng .csv hoặc .parquet")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(SCHEMA))
+    for frame in generate(n_rows, **options):
+        # float32 ghi thẳng sẽ thành 3.980000019...; đi qua chuỗi để giữ đúng 3.98
+        floats = frame.select_dtypes('float32').columns
+        frame = frame.astype({c: str for c in floats}).astype({c: 'float64' for c in floats})
+        for row in frame.itertuples(index=False):
+            sheet.append(row)
+    workbook.save(path)
+
+
+WRITERS = {'.csv': write_csv, '.parquet': write_parquet, '.xlsx': write_xlsx}
+
+
+def write(path, n_rows, **options):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Không hỗ trợ định dạng {ext!r}, chọn một trong {', '.join(WRITERS)}")
+    # Ghi ra file tạm rồi đổi tên để không bao giờ để lại file dở dang
+    tmp_path = f"{path}.{os.getpid()}.tmp{ext}"
+    try:
+        WRITERS[ext](tmp_path, n_rows, **options)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--out', required=True, help='.xlsx, .csv hoặc .parquet')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help='mặc định: số core')
+    args = parser.parse_args()
+    write(args.out, args.rows, seed=args.seed, chunk_size=args.chunk_size, workers=args.workers)
@@ -1,34 +1,32 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy.stats import gaussian_kde
-import numpy as np
+import charts
+from cube import slice_cube
+from dataset import load_age_prefix, load_cube_preview, load_figure_cache, rerun_when_exact
+import perf_panel
+from figure_cache import canonical_selection, chart_key
 
 st.set_page_config(page_title="Entrepreneurship Insights", layout="wide")
+perf_panel.start(__file__)
 
-@st.cache_data
-
-def load_data():
-    return pd.read_excel("education_career_success.xlsx")
-
-df = load_data()
+# exact = False: preview from a stratified sample while the exact cube is still being built
+cube, exact = load_cube_preview()
+fig_cache = load_figure_cache()
 
 # Sidebar Filters
 st.sidebar.title("Global Filters")
 
 # Gender Filter - Multiselect
-gender_options = ['All'] + sorted(df['Gender'].dropna().unique())
+gender_options = ['All'] + sorted(cube['Gender'].dropna().unique())
 selected_genders = st.sidebar.multiselect("Select Gender(s)", gender_options, default=['All'])
-if 'All' not in selected_genders:
-    df = df[df['Gender'].isin(selected_genders)]
+genders = canonical_selection(selected_genders, gender_options[1:])
+cube_gender = slice_cube(cube, genders=genders)
 
 # Job Level Filter
-job_levels = sorted(df['Current_Job_Level'].dropna().unique())
+job_levels = sorted(cube_gender['Current_Job_Level'].dropna().unique())
 selected_level = st.sidebar.selectbox("Select Job Level", job_levels)
 
 # Age Filter
-min_age, max_age = int(df['Age'].min()), int(df['Age'].max())
+min_age, max_age = int(cube_gender['Age'].min()), int(cube_gender['Age'].max())
 age_range = st.sidebar.slider("Select Age Range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
 
 # Entrepreneurship Status Filter - Individual Checkboxes
@@ -46,8 +44,15 @@ if show_no:
 if not selected_statuses:
     selected_statuses = ['Yes', 'No']
     
-# Color mapping
-color_map = {'Yes': '#FFD700', 'No': '#004080'}
+# Canonical filter state: 'All', every option and an empty selection share one cache key
+filter_state = dict(
+    genders=genders,
+    level=selected_level,
+    age_range=tuple(age_range),
+    statuses=canonical_selection(selected_statuses, ['Yes', 'No'])
+)
+if not exact:
+    filter_state['preview'] = True
 
 # --- Main Tabs ---
 graph_tab = st.tabs(["📊 Age & Job Offers", "📈 Age & Demographics"])
@@ -56,172 +61,69 @@ graph_tab = st.tabs(["📊 Age & Job Offers", "📈 Age & Demographics"])
 with graph_tab[0]:
     st.title("Entrepreneurship and Job Offers by Age")
     st.markdown("Analyze the relationship between entrepreneurship status, job level, and job offers across age groups.")
+    if not exact:
+        st.info("⏳ Preview from a stratified sample, error bars show 95% confidence intervals. "
+                "Exact results will replace it as soon as they are ready.")
+
+    # Cube slice for the selected level and age range (all statuses, for percentages). The exact
+    # cube answers the age window from its per-age prefix sums (age_prefix.py)
+    source = load_age_prefix() if exact else cube
+    cube_level = slice_cube(source, genders=genders, level=selected_level, age_range=age_range)
+    cube_filtered = slice_cube(cube_level, statuses=selected_statuses)
 
-    # Filtered data
-    df_filtered = df[(df['Current_Job_Level'] == selected_level) &
-                     (df['Age'].between(age_range[0], age_range[1])) &
-                     (df['Entrepreneurship'].isin(selected_statuses))]
-
-    # Grouped data for bar chart
-    df_grouped = (
-        df.groupby(['Current_Job_Level', 'Age', 'Entrepreneurship'])
-        .size()
-        .reset_index(name='Count')
-    )
-    df_grouped['Percentage'] = df_grouped.groupby(['Current_Job_Level', 'Age'])['Count'].transform(lambda x: x / x.sum())
-
-    df_bar = df_grouped[
-        (df_grouped['Current_Job_Level'] == selected_level) &
-        (df_grouped['Age'].between(age_range[0], age_range[1])) &
-        (df_grouped['Entrepreneurship'].isin(selected_statuses))
-    ]
-
-    even_ages = sorted(df_bar['Age'].unique())
-    even_ages = [age for age in even_ages if age % 2 == 0]
-
-    fig_bar = px.bar(
-        df_bar,
-        x='Age',
-        y='Percentage',
-        color='Entrepreneurship',
-        barmode='stack',
-        color_discrete_map=color_map,
-        category_orders={'Entrepreneurship': ['No', 'Yes']},
-        labels={'Age': 'Age', 'Percentage': 'Percentage'},
-        height=450,
-        width=1250,
-        title=f"Entrepreneurship Distribution by Age – {selected_level} Level"
-    )
-
-    fig_bar.update_traces(
-        hovertemplate="Entrepreneurship=%{customdata[0]}<br>Age=%{x}<br>Percentage=%{y:.0%}<extra></extra>",
-        customdata=df_bar[['Entrepreneurship']].values,
-        hoverinfo="skip"
-    )
-
-    fig_bar.update_layout(
-        margin=dict(t=40, l=40, r=40, b=40),
-        legend_title_text='Entrepreneurship',
-        xaxis_tickangle=0,
-        bargap=0.1,
-        xaxis=dict(tickvals=even_ages),
-        yaxis=dict(title="Percentage", range=[0, 1], tickformat=".0%"),
-        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
-    )
-
-    df_avg_offers = (
-        df_filtered
-        .groupby(['Age', 'Entrepreneurship'])['Job_Offers']
-        .mean()
-        .reset_index()
-    )
-
-    fig_line = go.Figure()
-    for status in selected_statuses:
-        data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
-        fig_line.add_trace(go.Scatter(
-            x=data_status["Age"],
-            y=data_status["Job_Offers"],
-            mode="lines+markers",
-            name=status,
-            line=dict(color=color_map[status], width=2),
-            marker=dict(size=6),
-            hovertemplate="%{y:.2f}"
-        ))
-
-    fig_line.update_layout(
-        margin=dict(t=40, l=40, r=40, b=40),
-        legend_title_text='Entrepreneurship',
-        xaxis_tickangle=0,
-        hovermode="x unified",
-        width=1250,
-        xaxis=dict(
-            showspikes=True,
-            spikemode='across',
-            spikesnap='cursor',
-            spikethickness=1.2,
-            spikedash='dot',
-            tickvals=even_ages
-        ),
-        yaxis=dict(
-            title="Average Job Offers",
-            showspikes=True,
-            spikemode='across',
-            spikesnap='cursor',
-            spikethickness=1.2,
-            spikedash='dot'
-        ),
-        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5)
-    )
+    # Figures come from charts.py, shared with the warm-up in warmup.py
+    def build_bar():
+        return charts.graphtab_bar(cube_level, selected_level, filter_state['statuses'], preview=not exact)
+
+    def build_line():
+        return charts.graphtab_line(cube_filtered, filter_state['statuses'], preview=not exact)
 
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(fig_bar, use_container_width=True)
+        perf_panel.plotly_chart(fig_cache.figure(chart_key('bar', **filter_state), build_bar), use_container_width=True)
     with col2:
-        st.plotly_chart(fig_line, use_container_width=True)
+        perf_panel.plotly_chart(fig_cache.figure(chart_key('line', **filter_state), build_line), use_container_width=True)
 
 # === TAB 2 ===
-with graph_tab[1]:
+# Fragment: changing chart_option reruns only this tab, not the Age & Job Offers charts.
+# Everything the tab depends on from the rest of the page is passed in as an argument.
+@perf_panel.fragment
+def demographics_tab(cube_filtered, filter_state, age_range, exact):
     st.title("Demographics by Age")
 
-    chart_option = st.selectbox("Select Variable for Visualization", ['Gender', 'Field of Study'])
+    chart_option = st.selectbox("Select Variable for Visualization", charts.CHART_OPTIONS)
+
+    def build_density():
+        return charts.graphtab_density(cube_filtered, chart_option, age_range)
 
-    df_demo = df[(df['Current_Job_Level'] == selected_level) &
-                 (df['Age'].between(age_range[0], age_range[1])) &
-                 (df['Entrepreneurship'].isin(selected_statuses))]
+    def build_donut():
+        return charts.graphtab_donut(cube_filtered, chart_option)
 
-    if df_demo.empty:
+    # The density and donut have no confidence intervals, so the sample cube is not shown here:
+    # the tab waits for the exact cube (rerun_when_exact reruns the page)
+    if not exact:
+        st.info("⏳ Preview from a stratified sample is running. "
+                "Demographic charts will appear as soon as the exact results are ready.")
+    elif cube_filtered.empty:
         st.warning("Not enough data to display charts.")
     else:
         col1, col2 = st.columns([1, 1])
 
         # Density Area Chart
         with col1:
-            fig_density = go.Figure()
-            group_col = 'Gender' if chart_option == 'Gender' else 'Field_of_Study'
-            title = f"Age Distribution by {group_col.replace('_', ' ')}"
-            categories = df_demo[group_col].dropna().unique()
-
-            for cat in categories:
-                age_data = df_demo[df_demo[group_col] == cat]['Age']
-                if len(age_data) > 1:
-                    kde = gaussian_kde(age_data)
-                    x_vals = np.linspace(age_range[0], age_range[1], 100)
-                    y_vals = kde(x_vals)
-                    fig_density.add_trace(go.Scatter(
-                        x=x_vals,
-                        y=y_vals,
-                        mode='lines',
-                        name=str(cat),
-                        fill='tozeroy'
-                    ))
-
-            fig_density.update_layout(
-                title=title,
-                xaxis_title="Age",
-                yaxis_title="Density",
-                height=500,
-                margin=dict(t=40, l=40, r=40, b=80),
-                legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5)
-            )
-            st.plotly_chart(fig_density, use_container_width=True)
+            fig_density = fig_cache.figure(chart_key('density', option=chart_option, **filter_state), build_density)
+            perf_panel.plotly_chart(fig_density, use_container_width=True)
 
         # Donut Chart
         with col2:
-            if chart_option == 'Gender':
-                counts = df_demo['Gender'].value_counts().reset_index()
-                counts.columns = ['Gender', 'Count']
-                labels, values = counts['Gender'], counts['Count']
-            else:
-                counts = df_demo['Field_of_Study'].value_counts().reset_index()
-                counts.columns = ['Field of Study', 'Count']
-                labels, values = counts['Field of Study'], counts['Count']
-
-            fig_donut = go.Figure(data=[go.Pie(labels=labels, values=values, hole=0.5)])
-            fig_donut.update_layout(
-                title=f"{chart_option} Distribution (Donut Chart)",
-                height=350,
-                margin=dict(t=40, l=40, r=40, b=40),
-                showlegend=True
-            )
-            st.plotly_chart(fig_donut, use_container_width=True)
+            fig_donut = fig_cache.figure(chart_key('donut', option=chart_option, **filter_state), build_donut)
+            perf_panel.plotly_chart(fig_donut, use_container_width=True)
+
+
+with graph_tab[1]:
+    demographics_tab(cube_filtered, filter_state, age_range, exact)
+
+if not exact:
+    rerun_when_exact()
+
+perf_panel.finish()
@@ -0,0 +1,88 @@
+import argparse
+import hashlib
+import os
+
+import streamlit as st
+from PIL import Image, ImageOps
+
+# Ảnh được resize/nén lại một lần vào thư mục static/ cạnh file app và phục vụ qua
+# static file serving của Streamlit (server.enableStaticServing trong .streamlit/config.toml).
+# Tên file chứa hash nội dung ảnh gốc nên trình duyệt cache được lâu dài (ETag/Last-Modified),
+# và mỗi lần rerun chỉ gửi URL thay vì cả ảnh base64.
+BACKGROUND_WIDTH = 1920
+TEAM_THUMB_SIZE = 180
+
+
+def _variant_name(src, suffix, ext):
+    with open(src, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(src))[0].replace(" ", "_")
+    return f"{stem}-{suffix}-{digest}.{ext}"
+
+
+def _save_variant(image, static_dir, name, fmt, **options):
+    path = os.path.join(static_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(static_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        image.save(tmp_path, fmt, **options)
+        os.replace(tmp_path, path)
+    return f"app/static/{name}"
+
+
+# (mtime, kích thước) của ảnh gốc: thêm vào key của st.cache_resource để ảnh bị thay khi server
+# đang chạy được xử lý lại thay vì phục vụ mãi bản cũ
+def _source_version(src):
+    stat = os.stat(src)
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Ảnh nền: bản WebP và bản JPEG dự phòng, rộng tối đa BACKGROUND_WIDTH px
+def background_urls(src, static_dir):
+    return _background_urls(src, static_dir, _source_version(src))
+
+
+@st.cache_resource
+def _background_urls(src, static_dir, version):
+    image = Image.open(src).convert("RGB")
+    image.thumbnail((BACKGROUND_WIDTH, BACKGROUND_WIDTH * 4))
+    width = image.width
+    webp = _save_variant(image, static_dir, _variant_name(src, f"bg{width}", "webp"), "WEBP", quality=80, method=6)
+    jpeg = _save_variant(image, static_dir, _variant_name(src, f"bg{width}", "jpg"), "JPEG", quality=82, optimize=True, progressive=True)
+    return webp, jpeg
+
+
+# CSS background dùng image-set để trình duyệt hỗ trợ WebP tải bản WebP, còn lại tải JPEG
+def background_css(src, static_dir):
+    webp, jpeg = background_urls(src, static_dir)
+    return (
+        f'background-image: url("{jpeg}");\n'
+        f'        background-image: image-set(url("{webp}") type("image/webp"), url("{jpeg}") type("image/jpeg"));'
+    )
+
+
+# Ảnh thành viên: cắt vuông TEAM_THUMB_SIZE px (giống object-fit: cover của .team-img)
+def team_thumbnail_url(src, static_dir):
+    return _team_thumbnail_url(src, static_dir, _source_version(src))
+
+
+@st.cache_resource
+def _team_thumbnail_url(src, static_dir, version):
+    image = Image.open(src).convert("RGB")
+    thumb = ImageOps.fit(image, (TEAM_THUMB_SIZE, TEAM_THUMB_SIZE), Image.LANCZOS)
+    name = _variant_name(src, f"{TEAM_THUMB_SIZE}px", "webp")
+    return _save_variant(thumb, static_dir, name, "WEBP", quality=85, method=6)
+
+
+# Tạo sẵn các bản ảnh khi build image:
+#   python homepage/assets.py --static-dir homepage/static --background homepage/images/homepage_bg.png homepage/team/*.png
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--static-dir", required=True)
+    parser.add_argument("--background", action="append", default=[])
+    parser.add_argument("team", nargs="*")
+    args = parser.parse_args()
+    for path in args.background:
+        print(*background_urls(path, args.static_dir))
+    for path in args.team:
+        print(team_thumbnail_url(path, args.static_dir))
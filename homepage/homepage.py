@@ -1,22 +1,19 @@
+import os
 import streamlit as st
-from PIL import Image
-import base64
+from assets import background_css, team_thumbnail_url
 
 # ===== SETUP PAGE =====
 st.set_page_config(page_title="Education Career App", layout="wide")
 
-# ===== EMBED BACKGROUND IMAGE IN BASE64 =====
-def get_base64(file_path):
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-bg_image = get_base64("homepage/images/homepage_bg.png")
+# ===== BACKGROUND IMAGE (STATIC FILE, RESIZED ONCE) =====
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+bg_css = background_css("homepage/images/homepage_bg.png", STATIC_DIR)
 
 # ===== CSS STYLES =====
 st.markdown(f"""
     <style>
     .stApp {{
-        background-image: url("data:image/png;base64,{bg_image}");
+        {bg_css}
         background-size: cover;
         background-position: center;
         background-attachment: fixed;
@@ -105,11 +102,9 @@ def show_team(page):
     for col, member in zip(cols, members):
         with col:
             try:
-                with open(member["image"], "rb") as f:
-                    data = f.read()
-                b64_img = base64.b64encode(data).decode()
+                img_url = team_thumbnail_url(member["image"], STATIC_DIR)
                 st.markdown(
-                    f'<img class="team-img" src="data:image/png;base64,{b64_img}"/>',
+                    f'<img class="team-img" src="{img_url}"/>',
                     unsafe_allow_html=True,
                 )
             except FileNotFoundError:
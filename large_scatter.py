@@ -0,0 +1,37 @@
+import numpy as np
+
+from perf import timed
+
+# Ngưỡng số điểm: ít hơn WEBGL_MIN_POINTS vẽ SVG như cũ, từ DENSITY_MIN_POINTS trở lên
+# không gửi từng điểm nữa mà gửi heatmap mật độ đã bin sẵn ở server
+WEBGL_MIN_POINTS = 1_000
+DENSITY_MIN_POINTS = 100_000
+DENSITY_BINS = (60, 60)
+OVERLAY_POINTS = 2_000
+
+
+def scatter_mode(n_points):
+    if n_points >= DENSITY_MIN_POINTS:
+        return "density"
+    if n_points >= WEBGL_MIN_POINTS:
+        return "webgl"
+    return "svg"
+
+
+# Histogram 2D bằng NumPy; trả về tâm các bin và ma trận đếm (hàng = y, cột = x) cho go.Heatmap
+@timed('aggregate')
+def binned_density(x, y, bins=DENSITY_BINS, range=None):
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=range)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    # Ô trống để NaN cho heatmap trong suốt thay vì tô màu 0
+    z = np.where(counts.T > 0, counts.T, np.nan)
+    return x_centers, y_centers, z
+
+
+# Chọn ngẫu nhiên (cố định seed) một số dòng để vẽ chồng lên heatmap
+def sample_positions(n_rows, n_samples=OVERLAY_POINTS, seed=0):
+    if n_rows <= n_samples:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_rows, size=n_samples, replace=False))
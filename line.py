@@ -1,22 +1,18 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import os
+import figure_spec as fs
+from dataset import load_balance_by_age
+import payload
+import perf_panel
 
 # Cài đặt trang
 st.set_page_config(page_title="Work-Life Balance by Age", layout="centered")
+perf_panel.start(__file__)
 st.title("💼 Work-Life Balance theo Age và Job Level")
 
-# Tải dữ liệu an toàn
-@st.cache_data
-def load_data():
-    file_path = "education_career_success.xlsx"
-    if not os.path.exists(file_path):
-        st.error(f"❌ File '{file_path}' không tồn tại. Vui lòng upload đúng file.")
-        st.stop()
-    return pd.read_excel(file_path)
-
-df = load_data()
+# Bảng (count, sum, sum of squares) của Work-Life Balance theo Job Level × Age, dựng sẵn từ cube
+# đếm/tổng (mean_table.py): mỗi level chỉ đọc một đoạn hàng của bảng. balance.xs là các tuổi có dữ liệu
+balance = load_balance_by_age()
+ages = balance.xs
 
 # Sidebar: chọn Job Level
 job_levels_order = ['Entry', 'Mid', 'Senior', 'Executive']
@@ -27,37 +23,18 @@ selected_levels = st.sidebar.multiselect(
 )
 
 # Sidebar: slicer chọn Age range
-min_age = int(df["Age"].min())
-max_age = int(df["Age"].max())
+min_age = int(ages[0])
+max_age = int(ages[-1])
 age_range = st.sidebar.slider(
     "📊 Chọn khoảng tuổi (Age):",
     min_value=min_age,
     max_value=max_age,
     value=(min_age, max_age)
 )
+show_se = st.sidebar.checkbox("📏 Hiện dải ±1 sai số chuẩn", value=False)
 
-# Lọc dữ liệu theo Age
-df_filtered = df[df["Age"].between(age_range[0], age_range[1])]
-
-# Tính trung bình Work-Life Balance theo Age và Job Level
-avg_balance = (
-    df_filtered.groupby(['Current_Job_Level', 'Age'])['Work_Life_Balance']
-    .mean()
-    .reset_index()
-)
-
-avg_balance['Current_Job_Level'] = pd.Categorical(
-    avg_balance['Current_Job_Level'],
-    categories=job_levels_order,
-    ordered=True
-)
-
-# Lọc theo Job Level nếu không chọn All
-if "All" not in selected_levels:
-    avg_balance = avg_balance[avg_balance["Current_Job_Level"].isin(selected_levels)]
-
-# Vẽ biểu đồ
-fig = go.Figure()
+# Vẽ biểu đồ: spec ghép thẳng từ dict (figure_spec.py), không qua validator của go.Scatter
+traces = []
 colors = {
     "Entry": "#1f77b4",      # blue
     "Mid": "#ff7f0e",        # orange
@@ -67,28 +44,31 @@ colors = {
 
 for level in job_levels_order:
     if "All" in selected_levels or level in selected_levels:
-        data_level = avg_balance[avg_balance["Current_Job_Level"] == level]
-        if not data_level.empty:
-            fig.add_trace(go.Scatter(
-                x=data_level["Age"],
-                y=data_level["Work_Life_Balance"],
+        level_ages, mean, se = balance.series(level, age_range)
+        if len(level_ages):
+            line = fs.scatter(
+                level_ages,
+                mean,
                 mode="lines+markers",
                 name=level,
                 line=dict(color=colors[level]),
                 hovertemplate="%{y:.2f}<extra></extra>"
-            ))
+            )
+            if show_se:
+                # Dải cùng legendgroup với đường: bấm legend ẩn/hiện cả hai
+                traces.append(fs.error_band(level_ages, mean, se, colors[level], legendgroup=level))
+                line['legendgroup'] = level
+            traces.append(line)
 
 # Cấu hình layout
-fig.update_layout(
-    title="📈 Trung bình Work-Life Balance theo Age",
-    xaxis_title="Age",
-    yaxis_title="Work-Life Balance",
+fig = fs.figure(traces, dict(
+    title=dict(text="📈 Trung bình Work-Life Balance theo Age", x=0.5),
     height=600,
     width=900,
-    title_x=0.5,
-    legend_title_text="Job Level",
+    legend=dict(title=fs.title("Job Level")),
     hovermode="x unified",
     xaxis=dict(
+        title=fs.title("Age"),
         showspikes=True,
         spikemode="across",
         spikecolor="gray",
@@ -97,6 +77,7 @@ fig.update_layout(
         spikethickness=1
     ),
     yaxis=dict(
+        title=fs.title("Work-Life Balance"),
         showspikes=True,
         spikemode="across",
         spikecolor="gray",
@@ -104,6 +85,8 @@ fig.update_layout(
         spikesnap="cursor",
         spikethickness=1
     )
-)
+))
+
+perf_panel.plotly_chart(payload.encode(fig), use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+perf_panel.finish()
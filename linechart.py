@@ -1,27 +1,17 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+import figure_spec as fs
+from dataset import load_balance_by_promotion
+import payload
+import perf_panel
 
-# Load dữ liệu
+perf_panel.start(__file__)
 
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx")
+# Bảng (count, sum, sum of squares) của Work-Life Balance theo Job Level × Years_to_Promotion,
+# dựng sẵn từ cube đếm/tổng (mean_table.py): mỗi level chỉ đọc một hàng của bảng
+balance = load_balance_by_promotion()
 
-df = load_data()
-
-# Tính trung bình Work-Life Balance theo Job Level và Years_to_Promotion
-avg_balance = (
-    df.groupby(['Current_Job_Level', 'Years_to_Promotion'])['Work_Life_Balance']
-    .mean()
-    .reset_index()
-)
-
-# Sắp xếp thứ tự cấp bậc công việc
+# Thứ tự cấp bậc công việc
 job_levels_order = ['Entry', 'Mid', 'Senior', 'Executive']
-avg_balance['Current_Job_Level'] = pd.Categorical(
-    avg_balance['Current_Job_Level'], categories=job_levels_order, ordered=True
-)
 
 # Sidebar chọn cấp bậc
 selected_levels = st.sidebar.multiselect(
@@ -29,14 +19,10 @@ selected_levels = st.sidebar.multiselect(
     options=job_levels_order + ["All"],
     default=["All"]
 )
+show_se = st.sidebar.checkbox("Show ±1 standard error band", value=False)
 
-if "All" in selected_levels or not selected_levels:
-    filtered_data = avg_balance
-else:
-    filtered_data = avg_balance[avg_balance["Current_Job_Level"].isin(selected_levels)]
-
-# Tạo biểu đồ bằng go.Figure
-fig = go.Figure()
+# Tạo biểu đồ: spec ghép thẳng từ dict (figure_spec.py), không qua validator của go.Scatter
+traces = []
 
 colors = {
     "Entry": "#1f77b4",      # blue
@@ -48,27 +34,30 @@ colors = {
 # Thêm từng trace cho mỗi Job Level
 for level in job_levels_order:
     if "All" in selected_levels or level in selected_levels:
-        data_level = filtered_data[filtered_data["Current_Job_Level"] == level]
-        fig.add_trace(go.Scatter(
-            x=data_level["Years_to_Promotion"],
-            y=data_level["Work_Life_Balance"],
+        years, mean, se = balance.series(level)
+        line = fs.scatter(
+            years,
+            mean,
             mode="lines+markers",
             name=level,
             line=dict(color=colors[level]),
             hovertemplate=f"%{{y:.2f}}"  # chỉ hiện giá trị, tên & màu trace tự hiển thị theo format 'x unified'
-        ))
+        )
+        if show_se:
+            # Dải cùng legendgroup với đường: bấm legend ẩn/hiện cả hai
+            traces.append(fs.error_band(years, mean, se, colors[level], legendgroup=level))
+            line['legendgroup'] = level
+        traces.append(line)
 
 # Cấu hình layout
-fig.update_layout(
-    title="Average Work-Life Balance by Years to Promotion",
-    xaxis_title="Years to Promotion",
-    yaxis_title="Average Work-Life Balance",
+fig = fs.figure(traces, dict(
+    title=dict(text="Average Work-Life Balance by Years to Promotion", x=0.5),
     height=600,
     width=900,
-    title_x=0.5,
-    legend_title_text="Job Level",
+    legend=dict(title=fs.title("Job Level")),
     hovermode="x unified",  # Tooltip gom nhóm & hiển thị line màu như ảnh mẫu
     xaxis=dict(
+        title=fs.title("Years to Promotion"),
         showspikes=True,
         spikemode="across",
         spikesnap="cursor",
@@ -77,6 +66,7 @@ fig.update_layout(
         spikecolor="gray"
     ),
     yaxis=dict(
+        title=fs.title("Average Work-Life Balance"),
         showspikes=True,
         spikemode="across",
         spikesnap="cursor",
@@ -84,9 +74,9 @@ fig.update_layout(
         spikethickness=1,
         spikecolor="gray"
     )
-)
+))
 
 # Hiển thị biểu đồ
-st.plotly_chart(fig, use_container_width=True)
-
+perf_panel.plotly_chart(payload.encode(fig), use_container_width=True)
 
+perf_panel.finish()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from cube import rollup
+from perf import timed
+
+# Bảng trung bình gộp được của một measure: với mỗi nhóm (Job Level) × giá trị x (Age,
+# Years_to_Promotion), số dòng, tổng và tổng bình phương trong mảng dày (nhóm × x). Ba đại lượng
+# này cộng được nên bảng là các ô của cube cộng lại (và vẫn đúng khi cube nối thêm dữ liệu);
+# trung bình và sai số chuẩn của một điểm chỉ cần ba số của điểm đó. Chọn vài nhóm và một khoảng
+# x là lấy các hàng và một đoạn cột: O(nhóm × x), không phụ thuộc số dòng dữ liệu.
+class MeanTable:
+    def __init__(self, cube, group, x, measure):
+        table = rollup(cube, [group, x])
+        self.groups = list(cube[group].cat.categories)
+        self.xs = np.sort(table[x].unique())
+
+        cells = (table[group].cat.codes.to_numpy(), np.searchsorted(self.xs, table[x].to_numpy()))
+        shape = (len(self.groups), len(self.xs))
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.total = np.zeros(shape, dtype=np.int64)
+        self.sumsq = np.zeros(shape, dtype=np.int64)
+        self.count[cells] = table['Count'].to_numpy()
+        self.total[cells] = table[f"{measure}_sum"].to_numpy()
+        self.sumsq[cells] = table[f"{measure}_sumsq"].to_numpy()
+
+    # (x, trung bình, sai số chuẩn) của một nhóm tại các x có dữ liệu trong x_range (gồm hai đầu).
+    # Sai số chuẩn = độ lệch chuẩn mẫu / sqrt(n), NaN khi điểm chỉ có một dòng.
+    @timed('aggregate')
+    def series(self, group, x_range=None):
+        lo, hi = 0, len(self.xs)
+        if x_range is not None:
+            lo = int(np.searchsorted(self.xs, x_range[0], side='left'))
+            hi = int(np.searchsorted(self.xs, x_range[1], side='right'))
+        row = self.groups.index(group)
+        has_rows = self.count[row, lo:hi] > 0
+
+        n = self.count[row, lo:hi][has_rows]
+        total = self.total[row, lo:hi][has_rows]
+        mean = total / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(n > 1, (self.sumsq[row, lo:hi][has_rows] - total * mean) / (n - 1), np.nan)
+        return self.xs[lo:hi][has_rows], mean, np.sqrt(np.clip(variance, 0, None) / n)
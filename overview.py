@@ -1,8 +1,8 @@
-import pandas as pd
 import streamlit as st
+from dataset import load_data
 
 # Load dataset
-df = pd.read_excel("education_career_success.xlsx")
+df = load_data()
 
 # Set page configuration
 st.set_page_config(page_title="Dataset Overview", layout="wide")
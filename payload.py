@@ -0,0 +1,84 @@
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Thu gọn spec của figure trước khi gửi cho trình duyệt (mảng số vẫn là typed array base64):
+# - số thực làm tròn tới SIG_DIGITS chữ số có nghĩa (so với giá trị lớn nhất của mảng), dư so với
+#   độ chính xác hiển thị của mọi biểu đồ (.0%, .2f, ,.0f) và nhỏ hơn một pixel trên trục,
+#   rồi gửi float32 nếu float32 giữ nguyên giá trị đã làm tròn (thay vì float64);
+# - mảng toàn số nguyên gửi bằng int8/int16/int32 nhỏ nhất đủ chứa;
+# - bỏ customdata không được dùng (trace tắt hover, hoặc không template nào đọc customdata).
+SIG_DIGITS = 6
+
+_INT_TYPES = [np.int8, np.int16, np.int32]
+
+
+def _narrow_int(values):
+    if values.size == 0:
+        return values
+    low, high = values.min(), values.max()
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype, copy=False)
+    return values
+
+
+def compact(values):
+    if values.dtype.kind in 'iu':
+        return _narrow_int(values)
+    if values.dtype.kind != 'f' or values.size == 0:
+        return values
+
+    finite = np.isfinite(values)
+    magnitude = np.abs(values[finite]).max() if finite.any() else 0
+    decimals = SIG_DIGITS - 1 - int(np.floor(np.log10(magnitude))) if magnitude > 0 else 0
+    rounded = np.round(values.astype(np.float64), decimals)
+    if finite.all() and np.array_equal(rounded, np.round(rounded)):
+        narrowed = _narrow_int(rounded.astype(np.int64))
+        if narrowed.dtype != np.int64:
+            return narrowed
+    as_float32 = rounded.astype(np.float32)
+    if np.array_equal(np.round(as_float32.astype(np.float64), decimals), rounded, equal_nan=True):
+        return as_float32
+    return rounded
+
+
+# customdata chỉ được đọc qua hovertemplate / texttemplate; hoverinfo='skip' tắt hẳn hover
+def _uses_customdata(trace):
+    templates = ['texttemplate'] if trace.get('hoverinfo') == 'skip' else ['texttemplate', 'hovertemplate']
+    return any('customdata' in str(trace.get(key, '')) for key in templates)
+
+
+# Typed array {dtype, bdata[, shape]} mà fig.to_dict() trả về -> ndarray
+def _decode(spec):
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype=spec['dtype'])
+    if 'shape' in spec:
+        values = values.reshape([int(n) for n in str(spec['shape']).split(',')])
+    return values
+
+
+def _encode_value(value):
+    if isinstance(value, np.ndarray):
+        return compact(value)
+    if isinstance(value, dict) and 'bdata' in value and 'dtype' in value:
+        return compact(_decode(value))
+    if isinstance(value, dict):
+        return {key: _encode_value(v) for key, v in value.items()}
+    return value
+
+
+def encode_trace(trace):
+    trace = {key: _encode_value(value) for key, value in trace.items()}
+    if 'customdata' in trace and not _uses_customdata(trace):
+        del trace['customdata']
+    return trace
+
+
+# Figure mới (không qua validator) với các trace đã thu gọn; layout giữ nguyên. Gọi lại trên
+# figure đã thu gọn (figure lấy từ FigureCache) không đổi gì.
+def encode(fig):
+    spec = fig.to_dict()
+    spec['data'] = [encode_trace(trace) for trace in spec['data']]
+    return go.Figure(spec, _validate=False)
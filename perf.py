@@ -0,0 +1,132 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Thời gian theo phase (load / filter / aggregate / kde / figure / render) của các lần rerun.
+# Phase lồng nhau tính riêng (exclusive): khi vào phase con, phase cha tạm dừng,
+# nên tổng các phase không vượt quá thời gian thật của lần rerun.
+#
+# Chỉ ghi khi được bật: enable() gom vào bộ đếm chung của process (benchmark),
+# begin_run() ghi cho lần rerun đang chạy trên thread hiện tại (panel / log JSON).
+# Khi tắt cả hai, mỗi hàm @timed chỉ tốn thêm một phép kiểm tra.
+PHASES = ['load', 'filter', 'aggregate', 'kde', 'figure', 'render']
+
+_lock = threading.Lock()
+_totals = defaultdict(float)
+_enabled = False
+
+
+class _Local(threading.local):
+    run = None
+    stack = None
+
+
+_local = _Local()
+_off = nullcontext()
+
+
+def phase(name):
+    if not _enabled and _local.run is None:
+        return _off
+    return _phase(name)
+
+
+@contextmanager
+def _phase(name):
+    stack = _local.stack
+    if stack is None:
+        stack = _local.stack = []
+    now = time.perf_counter()
+    if stack:
+        _add(stack[-1][0], now - stack[-1][1])
+    stack.append([name, now])
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        name, start = stack.pop()
+        _add(name, now - start)
+        if stack:
+            stack[-1][1] = now
+
+
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and _local.run is None:
+                return func(*args, **kwargs)
+            with _phase(name):
+                return func(*args, **kwargs)
+        if hasattr(func, 'clear'):
+            wrapper.clear = func.clear  # giữ .clear() của hàm st.cache_*
+        return wrapper
+    return decorator
+
+
+# Cộng thời gian đo sẵn (không tính exclusive), ví dụ tổng thời gian một fragment
+def record(name, seconds):
+    if _enabled or _local.run is not None:
+        _add(name, seconds)
+
+
+def _add(name, seconds):
+    run = _local.run
+    if run is not None:
+        run['phases'][name] += seconds
+    if _enabled:
+        with _lock:
+            _totals[name] += seconds
+
+
+# Chia thời gian một lần rerun (ms) theo phase. 'figure' là phần còn lại: dựng figure
+# trong trang, widget và mọi thứ chưa được đo riêng.
+def breakdown(phases_ms, wall_ms):
+    result = {name: phases_ms.get(name, 0.0) for name in PHASES if name != 'figure'}
+    result['figure'] = max(wall_ms - sum(result.values()), 0.0)
+    return result
+
+
+# Bộ đếm chung, dùng trong benchmark: enable() một lần, reset() trước mỗi lần rerun
+# và totals() sau khi rerun xong
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def reset():
+    with _lock:
+        _totals.clear()
+
+
+def totals():
+    with _lock:
+        return dict(_totals)
+
+
+# Ghi riêng cho lần rerun đang chạy trên thread này (mỗi session Streamlit một thread)
+def begin_run(page):
+    _local.stack = []
+    _local.run = {
+        'page': page,
+        'started': time.time(),
+        'start': time.perf_counter(),
+        'phases': defaultdict(float),
+        'charts': [],
+    }
+    return _local.run
+
+
+def current_run():
+    return _local.run
+
+
+def end_run():
+    run = _local.run
+    _local.run = None
+    _local.stack = []
+    if run is not None:
+        run['wall'] = time.perf_counter() - run.pop('start')
+    return run
@@ -0,0 +1,140 @@
+import functools
+import json
+import os
+import time
+
+import pandas as pd
+import plotly.io
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import perf
+
+# Panel hiệu năng trong sidebar (bật bằng toggle "⏱ Performance" cuối sidebar) và log JSON
+# một dòng cho mỗi lần rerun. Trang gọi start() ở đầu, plotly_chart() thay cho
+# st.plotly_chart và finish() ở cuối. Đặt biến môi trường PERF_LOG=<file> để luôn ghi log
+# kể cả khi panel tắt; khi panel tắt và không có PERF_LOG thì không đo gì cả. Trang dùng figure
+# cache thì log có thêm số hit/miss của lần rerun và stats() của cả cache.
+# Fragment của trang dùng @fragment thay cho @st.fragment để lần chạy lại riêng fragment
+# cũng được ghi log (panel trong sidebar chỉ cập nhật khi chạy lại cả trang).
+PANEL_KEY = 'perf_panel'
+LOG_FILE = os.environ.get('PERF_LOG')
+DEFAULT_LOG_FILE = os.path.join('.cache', 'perf.jsonl')
+
+
+def _panel_on():
+    return bool(st.session_state.get(PANEL_KEY, False))
+
+
+def start(page):
+    perf.end_run()  # bỏ lần đo dở dang nếu rerun trước bị dừng giữa chừng
+    if _panel_on() or LOG_FILE:
+        run = perf.begin_run(os.path.basename(page))
+        run['overhead'] = 0.0
+
+
+def _chart_name(fig, i):
+    title = fig.layout.title.text
+    return title if title else f"chart {i + 1}"
+
+
+# st.plotly_chart có đo thời gian render. Figure phải đã được thu gọn bằng payload.encode ở nơi
+# dựng (FigureCache, warmup hoặc trang), ở đây không encode lại. Khi đang đo thì
+# ghi thêm số byte JSON của figure (đúng chuỗi Streamlit gửi cho trình duyệt). Phần đo byte không
+# tính vào thời gian rerun.
+def plotly_chart(fig, **kwargs):
+    run = perf.current_run()
+    start_render = time.perf_counter()
+    with perf.phase('render'):
+        element = st.plotly_chart(fig, **kwargs)
+    if run is None:
+        return element
+
+    render = time.perf_counter() - start_render
+    start_measure = time.perf_counter()
+    run['charts'].append({
+        'chart': _chart_name(fig, len(run['charts'])),
+        'bytes': len(plotly.io.to_json(fig, validate=False).encode()),
+        'render_ms': round(render * 1000, 3),
+    })
+    run['overhead'] += time.perf_counter() - start_measure
+    return element
+
+
+def _record(run):
+    wall_ms = (run['wall'] - run['overhead']) * 1000
+    phases_ms = {name: seconds * 1000 for name, seconds in run['phases'].items()}
+    record = {
+        'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(run['started'])),
+        'page': run['page'],
+        'wall_ms': round(wall_ms, 3),
+        'phases_ms': {name: round(ms, 3) for name, ms in perf.breakdown(phases_ms, wall_ms).items()},
+        'payload_bytes': sum(chart['bytes'] for chart in run['charts']),
+        'charts': run['charts'],
+    }
+    if 'figure_cache' in run:
+        record['figure_cache'] = run['figure_cache']
+    return record
+
+
+def _write_log(record):
+    path = LOG_FILE or DEFAULT_LOG_FILE
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def finish():
+    run = perf.end_run()
+    show = st.sidebar.toggle("⏱ Performance", key=PANEL_KEY)
+    if run is None:
+        return
+
+    record = _record(run)
+    _write_log(record)
+    if not show:
+        return
+    with st.sidebar.expander(f"Rerun: {record['wall_ms']:.1f} ms", expanded=True):
+        phases = pd.DataFrame(
+            {'ms': list(record['phases_ms'].values())}, index=list(record['phases_ms'])
+        )
+        st.dataframe(phases.style.format('{:.1f}'), use_container_width=True)
+        if record['charts']:
+            charts = pd.DataFrame(record['charts']).set_index('chart')
+            charts['KiB'] = charts.pop('bytes') / 1024
+            st.dataframe(charts.style.format('{:.1f}'), use_container_width=True)
+            st.caption(f"Payload: {record['payload_bytes'] / 1024:.1f} KiB")
+        if 'figure_cache' in record:
+            counts = record['figure_cache']
+            cache = counts['cache']
+            st.caption(f"Figure cache: {counts['hits']} hit / {counts['misses']} miss "
+                       f"(total {cache['hits']} / {cache['misses']}, {cache['size']} / {cache['maxsize']} figures)")
+
+
+# st.fragment có đo thời gian: trong lần chạy cả trang, thời gian của fragment được cộng vào
+# 'fragment:<tên hàm>'; lần chạy lại riêng fragment được ghi thành một dòng log riêng
+# với page = "<trang>#<tên hàm>".
+def fragment(func):
+    name = func.__name__
+
+    @st.fragment
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        fragment_rerun = ctx is not None and bool(ctx.fragment_ids_this_run)
+        if fragment_rerun:
+            perf.end_run()
+            if _panel_on() or LOG_FILE:
+                run = perf.begin_run(f"{os.path.basename(ctx.main_script_path)}#{name}")
+                run['overhead'] = 0.0
+
+        start_fragment = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            perf.record(f"fragment:{name}", time.perf_counter() - start_fragment)
+            if fragment_rerun:
+                run = perf.end_run()
+                if run is not None:
+                    _write_log(_record(run))
+    return wrapper
@@ -1,56 +1,111 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+from dataset import load_data, load_trendline
+import payload
+import perf_panel
+from large_scatter import binned_density, sample_positions, scatter_mode
+from perf import phase
+from trendline import gpa_groups
 
-st.title("🎓 University GPA vs. Starting Salary")
+perf_panel.start(__file__)
 
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx", sheet_name=0)
+st.title("🎓 University GPA vs. Starting Salary")
 
+# Tạo nhóm GPA (dùng assign để không sửa frame dùng chung)
 df = load_data()
-
-# Tạo nhóm GPA
-df["GPA_Group"] = pd.cut(
-    df["University_GPA"],
-    bins=[2.0, 2.5, 3.0, 3.5, 4.0],
-    labels=["2.0–2.5", "2.5–3.0", "3.0–3.5", "3.5–4.0"],
-    include_lowest=True
-)
+with phase('filter'):
+    df = df.assign(GPA_Group=gpa_groups(df["University_GPA"]))
+trend = load_trendline()
 
 # Lựa chọn nhóm GPA
 selected_gpa = st.selectbox("Select GPA Group", ["All"] + df["GPA_Group"].cat.categories.tolist())
 
 # Lựa chọn khoảng lương
-salary_min, salary_max = int(df["Starting_Salary"].min()), int(df["Starting_Salary"].max())
+salary_min, salary_max = int(trend.levels[0]), int(trend.levels[-1])
 salary_range = st.slider("Select Starting Salary Range", salary_min, salary_max, (salary_min, salary_max), 1000)
 
 # Lọc dữ liệu
-mask = df["Starting_Salary"].between(*salary_range)
-if selected_gpa != "All":
-    mask &= (df["GPA_Group"] == selected_gpa)
-filtered_df = df[mask]
-
-# Vẽ biểu đồ scatter plot có đường hồi quy bằng plotly express
-fig = px.scatter(
-    filtered_df,
-    x="University_GPA",
-    y="Starting_Salary",
-    trendline="ols",  # thêm đường hồi quy tuyến tính
-    opacity=0.7,
-    labels={
-        "University_GPA": "University GPA",
-        "Starting_Salary": "Starting Salary"
-    },
-    title="GPA vs. Starting Salary"
-)
+with phase('filter'):
+    mask = df["Starting_Salary"].between(*salary_range)
+    if selected_gpa != "All":
+        mask &= (df["GPA_Group"] == selected_gpa)
+    filtered_df = df[mask]
 
-fig.data[1].line.color = '#FFA500'  # màu cam
+# Chọn cách vẽ theo số điểm: SVG, WebGL hoặc heatmap mật độ (bin ở server)
+mode = scatter_mode(len(filtered_df))
 
-fig.data[0].marker.color = '#00BFFF'  # màu DeepSkyBlue (xanh dương sáng)
+if mode == "density":
+    show_sample = st.checkbox("Show sampled points", value=True)
+    x = filtered_df["University_GPA"].to_numpy()
+    y = filtered_df["Starting_Salary"].to_numpy()
+
+    x_centers, y_centers, z = binned_density(x, y)
+    fig = go.Figure(go.Heatmap(
+        x=x_centers,
+        y=y_centers,
+        z=z,
+        colorscale="Blues",
+        colorbar=dict(title="Count"),
+        hovertemplate="GPA=%{x:.2f}<br>Salary=%{y:,.0f}<br>Count=%{z}<extra></extra>"
+    ))
+    if show_sample:
+        rows = sample_positions(len(filtered_df))
+        fig.add_trace(go.Scattergl(
+            x=x[rows],
+            y=y[rows],
+            mode="markers",
+            name="Sample",
+            marker=dict(color='#00BFFF', opacity=0.7, size=4)
+        ))
+    fig.update_layout(
+        title="GPA vs. Starting Salary",
+        xaxis_title="University GPA",
+        yaxis_title="Starting Salary",
+        showlegend=False
+    )
+else:
+    # Vẽ biểu đồ scatter plot bằng plotly express
+    fig = px.scatter(
+        filtered_df,
+        x="University_GPA",
+        y="Starting_Salary",
+        opacity=0.7,
+        render_mode="webgl" if mode == "webgl" else "svg",
+        labels={
+            "University_GPA": "University GPA",
+            "Starting_Salary": "Starting Salary"
+        },
+        title="GPA vs. Starting Salary"
+    )
+
+    fig.data[0].marker.color = '#00BFFF'  # màu DeepSkyBlue (xanh dương sáng)
+
+# Đường hồi quy tuyến tính: tính O(1) từ thống kê đủ đã cộng dồn, không cần statsmodels
+fit = trend.fit(None if selected_gpa == "All" else selected_gpa, salary_range)
+if fit is not None:
+    slope, intercept, r2 = fit
+    x_line = np.array([filtered_df["University_GPA"].min(), filtered_df["University_GPA"].max()])
+    fig.add_trace(go.Scatter(
+        x=x_line,
+        y=intercept + slope * x_line,
+        mode="lines",
+        showlegend=False,
+        line=dict(color='#FFA500'),  # màu cam
+        hovertemplate=(
+            "<b>OLS trendline</b><br>"
+            f"Starting_Salary = {slope:.6g} * University_GPA + {intercept:.6g}<br>"
+            f"R<sup>2</sup>={r2:.6f}<br><br>"
+            "University GPA=%{x}<br>Starting Salary=%{y} <b>(trend)</b><extra></extra>"
+        )
+    ))
+    st.caption(f"OLS trendline: slope = {slope:,.0f} per GPA point, R² = {r2:.4f}")
 
 # Tăng chiều cao biểu đồ
 fig.update_layout(
     height= 700,
 )
-st.plotly_chart(fig, use_container_width=True)
+perf_panel.plotly_chart(payload.encode(fig), use_container_width=True)
+
+perf_panel.finish()
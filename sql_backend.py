@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+
+from cube import CUBE_DIMS, CUBE_MEASURES
+from perf import timed
+
+try:
+    import duckdb
+except ImportError:  # backend tùy chọn: pip install duckdb
+    duckdb = None
+
+# Backend SQL nhúng (DuckDB) đọc thẳng file Parquet trên đĩa: cube của các trang là một câu
+# GROUP BY chạy song song nhiều thread và chỉ trả về bảng kết quả nhỏ, nên không cần nạp cả
+# dữ liệu vào RAM (dùng được cả khi dữ liệu lớn hơn bộ nhớ). Bộ lọc của trang chạy trên cube.
+
+
+def available():
+    return duckdb is not None
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# deltas: các DataFrame nối thêm sau file Parquet (data_manager), được chép vào bảng của
+# DuckDB (cursor không thấy DataFrame register trên connection gốc) rồi nối vào view
+class SqlBackend:
+    def __init__(self, parquet_path, threads=None, deltas=()):
+        self.parquet_path = parquet_path
+        self._con = duckdb.connect()
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        # file_row_number = vị trí dòng trong file, dùng cho First_Row của cube; các dòng
+        # của delta được đánh số tiếp sau file
+        path = parquet_path.replace("'", "''")
+        selects = [f"SELECT * FROM read_parquet('{path}', file_row_number = true)"]
+        offset = self._con.execute(f"SELECT count(*) FROM read_parquet('{path}')").fetchone()[0]
+        for i, delta in enumerate(deltas):
+            self._con.register("delta", delta.assign(file_row_number=np.arange(offset, offset + len(delta))))
+            self._con.execute(f"CREATE TABLE delta_{i} AS SELECT * FROM delta")
+            self._con.unregister("delta")
+            selects.append(f"SELECT * FROM delta_{i}")
+            offset += len(delta)
+        self._con.execute("CREATE VIEW data AS " + " UNION ALL BY NAME ".join(selects))
+        self._lock = threading.Lock()
+
+    # Mỗi thread (session Streamlit) dùng cursor riêng của cùng một database
+    def query(self, sql, params=()):
+        with self._lock:
+            cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, list(params)).to_arrow_table().to_pandas()
+        finally:
+            cursor.close()
+
+    # Cùng kết quả với cube.build_cube(df): Count, First_Row, tổng và tổng bình phương các
+    # measure theo `dims`, sắp theo dims như groupby của pandas
+    @timed('aggregate')
+    def cube(self, dims=CUBE_DIMS, measures=CUBE_MEASURES):
+        keys = ", ".join(_quote(d) for d in dims)
+        sums = "".join(f", sum({_quote(m)})::BIGINT AS {_quote(m + '_sum')}" for m in measures)
+        sums += "".join(
+            f", sum({_quote(m)}::BIGINT * {_quote(m)})::BIGINT AS {_quote(m + '_sumsq')}" for m in measures
+        )
+        return self.query(
+            f"SELECT {keys}, count(*) AS \"Count\", min(file_row_number) AS \"First_Row\"{sums} "
+            f"FROM data GROUP BY {keys} ORDER BY {keys} NULLS LAST"
+        )
+
+    # Các giá trị của `ids` đã có trong cột Student_ID (kiểm tra delta trước khi nối)
+    def known_ids(self, ids):
+        table = self.query(
+            'SELECT DISTINCT "Student_ID" FROM data WHERE "Student_ID" IN (SELECT unnest(?::VARCHAR[]))',
+            [list(ids)],
+        )
+        return table["Student_ID"].tolist()
@@ -1,39 +1,44 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+import charts
+import figure_spec as fs
+from dataset import SCHEMA, load_data, load_index
+from figure_cache import canonical_selection
+import payload
+import perf_panel
+from perf import phase
 
 st.set_page_config(
     page_title="Career Insights Dashboard",
     layout="wide",
     page_icon="🍩"
 )
+perf_panel.start(__file__)
 
 st.title("🍩 Career Insights Dashboard")
 
 # Load data
-@st.cache_data
-def load_data():
-    return pd.read_excel("education_career_success.xlsx", sheet_name='education_career_success')
-
 df = load_data()
-df = df[df['Entrepreneurship'].isin(['Yes', 'No'])]  # Ensure clean binary values
+index = load_index()
 
 # Sidebar filters
 st.sidebar.title("🎯 Filter Options")
 
-# Gender filter
-genders = sorted(df['Gender'].dropna().unique())
-selected_genders = st.sidebar.selectbox("Select Gender", genders, default=genders)
+# Gender filter (bỏ chọn hết = mọi giới tính, như graphtab)
+genders = sorted(index.bitmaps['Gender'])
+selected_genders = st.sidebar.multiselect("Select Gender", genders, default=genders)
 
-# Job level filter
-job_levels = sorted(df['Current_Job_Level'].dropna().unique())
+# Job level filter, theo thứ tự Entry < Mid < Senior < Executive của SCHEMA
+job_levels = [level for level in SCHEMA['Current_Job_Level'].categories if level in index.bitmaps['Current_Job_Level']]
 selected_level = st.sidebar.selectbox("Select Job Level", job_levels)
 
-# Filtered base dataframe
-df_filtered = df[
-    (df['Gender'].isin(selected_genders)) &
-    (df['Current_Job_Level'] == selected_level)
-]
+# Filtered base dataframe (AND các bitmap, chỉ giữ Yes/No)
+rows = index.select(
+    Entrepreneurship=['Yes', 'No'],
+    Gender=canonical_selection(selected_genders, genders),
+    Current_Job_Level=[selected_level]
+)
+df_filtered = df.take(rows)
 
 # Age filter (based on filtered data)
 min_age, max_age = int(df_filtered['Age'].min()), int(df_filtered['Age'].max())
@@ -44,38 +49,44 @@ selected_statuses = st.sidebar.multiselect("Select Entrepreneurship Status", ['Y
 
 # Function to generate donut chart without legend
 def plot_donut(data, column, title):
-    count_data = data[column].value_counts().reset_index()
+    # Như value_counts() trên cột chuỗi: nhiều dòng trước, bằng nhau thì giá trị xuất hiện trước;
+    # với cột category thì không kèm các giá trị không có dòng nào
+    count_data = data[column].value_counts(sort=False).reindex(data[column].dropna().unique())
+    count_data = count_data.sort_values(ascending=False, kind='stable').reset_index()
     count_data.columns = [column, 'Count']
-    fig = px.pie(
-        count_data,
-        names=column,
-        values='Count',
-        hole=0.5,
-        title=title
-    )
-    fig.update_traces(textinfo='percent+label', showlegend=False)
-    fig.update_layout(margin=dict(t=40, b=0, l=0, r=0))
-    return fig
+    # Spec của px.pie(..., hole=0.5) ghép thẳng từ dict (figure_spec.py), không qua validator
+    trace = fs.px_pie_trace(count_data, column, 'Count', hole=0.5)
+    trace.update(textinfo='percent+label', showlegend=False)
+    return payload.encode(fs.figure([trace], dict(
+        legend=dict(tracegroupgap=0),
+        title=fs.title(title),
+        margin=dict(t=40, b=0, l=0, r=0)
+    )))
 
 # Display 3 donut charts
 st.subheader("📊 Donut Charts Overview")
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.plotly_chart(plot_donut(df_filtered, 'Entrepreneurship', 'Entrepreneurship'), use_container_width=True)
+    perf_panel.plotly_chart(plot_donut(df_filtered, 'Entrepreneurship', 'Entrepreneurship'), use_container_width=True)
 with col2:
-    st.plotly_chart(plot_donut(df_filtered, 'Years_to_Promotion', 'Years to Promotion'), use_container_width=True)
+    perf_panel.plotly_chart(plot_donut(df_filtered, 'Years_to_Promotion', 'Years to Promotion'), use_container_width=True)
 with col3:
-    st.plotly_chart(plot_donut(df_filtered, 'Field_of_Study', 'Field of Study'), use_container_width=True)
+    perf_panel.plotly_chart(plot_donut(df_filtered, 'Field_of_Study', 'Field of Study'), use_container_width=True)
 
 st.markdown(f"### 👥 Total Records for '{selected_level}' and selected gender(s): {len(df_filtered)}")
 
 # Bar + Area Chart Section
-df_grouped = (
-    df_filtered.groupby(['Age', 'Entrepreneurship'])
-      .size()
-      .reset_index(name='Count')
-)
-df_grouped['Percentage'] = df_grouped.groupby('Age')['Count'].transform(lambda x: x / x.sum())
+with phase('aggregate'):
+    df_grouped = (
+        df_filtered.groupby(['Age', 'Entrepreneurship'], observed=True)
+          .size()
+          .reset_index(name='Count')
+    )
+    df_grouped['Percentage'] = df_grouped.groupby('Age')['Count'].transform(lambda x: x / x.sum())
+    filtered = df_grouped[
+        df_grouped['Age'].between(age_range[0], age_range[1]) &
+        df_grouped['Entrepreneurship'].isin(selected_statuses)
+    ]
 
 
 # Font size utility
@@ -93,42 +104,8 @@ else:
     font_size = font_size_by_count(len(ages))
     chart_width = max(400, min(1200, 50 * len(ages) + 100))
 
-    # Bar Chart
-    fig_bar = px.bar(
-        filtered,
-        x='Age',
-        y='Percentage',
-        color='Entrepreneurship',
-        barmode='stack',
-        color_discrete_map=color_map,
-        category_orders={'Entrepreneurship': ['No', 'Yes'], 'Age': ages},
-        labels={'Age': 'Age', 'Percentage': 'Percentage'},
-        height=400,
-        width=chart_width,
-        title=f"{selected_level} Level – Entrepreneurship by Age (%)"
-    )
-
-    for status in ['No', 'Yes']:
-        for _, row in filtered[filtered['Entrepreneurship'] == status].iterrows():
-            if row['Percentage'] > 0:
-                y_pos = 0.2 if status == 'No' else 0.9
-                fig_bar.add_annotation(
-                    x=row['Age'],
-                    y=y_pos,
-                    text=f"{row['Percentage']:.0%}",
-                    showarrow=False,
-                    font=dict(color="white", size=font_size),
-                    xanchor="center",
-                    yanchor="middle"
-                )
-
-    fig_bar.update_layout(
-        margin=dict(t=40, l=40, r=40, b=40),
-        legend_title_text='Entrepreneurship',
-        xaxis_tickangle=90,
-        bargap=0.1
-    )
-    fig_bar.update_yaxes(tickformat=".0%", title="Percentage")
+    # Bar Chart (charts.py): nhãn % là một trace text dựng một lần từ cả frame
+    fig_bar = charts.sunburst_bar(filtered, selected_level, ages, font_size, chart_width, color_map)
 
     # Area Chart
     fig_area = px.area(
@@ -155,6 +132,8 @@ else:
     # Display side by side
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(fig_bar, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_bar), use_container_width=True)
     with col2:
-        st.plotly_chart(fig_area, use_container_width=True)
+        perf_panel.plotly_chart(payload.encode(fig_area), use_container_width=True)
+
+perf_panel.finish()
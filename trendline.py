@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+# Nhóm GPA dùng trong scatter.py
+GPA_BINS = [2.0, 2.5, 3.0, 3.5, 4.0]
+GPA_LABELS = ["2.0–2.5", "2.5–3.0", "3.0–3.5", "3.5–4.0"]
+
+
+def gpa_groups(gpa):
+    return pd.cut(gpa, bins=GPA_BINS, labels=GPA_LABELS, include_lowest=True)
+
+
+# Thống kê đủ (n, Σx, Σy, Σxy, Σx², Σy²) của hồi quy y ~ x, cộng dồn theo từng mức y đã sắp xếp
+# cho mỗi nhóm. Một khoảng [y_min, y_max] bất kỳ = hiệu của hai giá trị cộng dồn,
+# nên đường hồi quy, slope và R² của mọi lựa chọn nhóm × khoảng lương đều O(1).
+class TrendlineStats:
+    def __init__(self, x, y, groups):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        groups = pd.Categorical(groups)
+
+        # Trừ trung bình trước khi cộng dồn để tránh mất chính xác khi n lớn
+        self.x_shift, self.y_shift = x.mean(), y.mean()
+        dx, dy = x - self.x_shift, y - self.y_shift
+
+        self.levels = np.unique(y)
+        level_pos = np.searchsorted(self.levels, y)
+        columns = np.stack([np.ones_like(dx), dx, dy, dx * dy, dx * dx, dy * dy], axis=1)
+
+        self.prefix = {}
+        for group in [None] + list(groups.categories):
+            mask = slice(None) if group is None else np.asarray(groups == group)
+            per_level = np.stack([
+                np.bincount(level_pos[mask], weights=col[mask], minlength=len(self.levels))
+                for col in columns.T
+            ], axis=1)
+            self.prefix[group] = np.vstack([np.zeros(columns.shape[1]), per_level.cumsum(axis=0)])
+
+    # group=None: tất cả các dòng
+    def stats(self, group, y_range):
+        prefix = self.prefix[group]
+        lo = np.searchsorted(self.levels, y_range[0], side='left')
+        hi = np.searchsorted(self.levels, y_range[1], side='right')
+        return prefix[hi] - prefix[lo]
+
+    # (slope, intercept, r2) theo đơn vị gốc; None nếu không đủ dữ liệu để hồi quy
+    @timed('aggregate')
+    def fit(self, group, y_range):
+        n, sx, sy, sxy, sxx, syy = self.stats(group, y_range)
+        sxx_c = sxx - sx * sx / n if n else 0.0
+        if n < 2 or sxx_c <= 0:
+            return None
+        sxy_c = sxy - sx * sy / n
+        syy_c = syy - sy * sy / n
+        slope = sxy_c / sxx_c
+        intercept = (sy - slope * sx) / n + self.y_shift - slope * self.x_shift
+        r2 = sxy_c * sxy_c / (sxx_c * syy_c) if syy_c > 0 else 0.0
+        return slope, intercept, r2
@@ -0,0 +1,203 @@
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly
+import plotly.io as pio
+
+import charts
+import payload
+from cube import slice_cube
+from data_cache import CACHE_DIR, remove_stale
+from figure_cache import FigureCache, chart_key
+
+logger = logging.getLogger(__name__)
+
+# Làm nóng figure cache: ngay sau khi nạp dữ liệu, dựng sẵn figure của graphtab.py và
+# stackedbarchart.py cho mọi tổ hợp bộ lọc thường gặp (mọi lựa chọn giới tính, Job Level,
+# status, chart option; khoảng tuổi mặc định) trong một process pool, để lần bấm đầu tiên
+# của mọi người dùng đều trúng cache. Key trùng với key trang tự tạo (charts.py).
+#
+# Kết quả được ghi ra .cache/ theo hash dữ liệu và hash code dựng figure: lần khởi động sau
+# (hoặc image đã chạy `python warmup.py` lúc build) chỉ việc đọc file.
+#
+#   python warmup.py --workers 4
+WORKERS = int(os.environ.get("WARMUP_WORKERS", os.cpu_count() or 1))
+STATUS_SELECTIONS = [None, ('No',), ('Yes',)]
+CODE_FILES = ['age_prefix.py', 'charts.py', 'cube.py', 'density.py', 'figure_spec.py', 'payload.py', 'sample.py']
+
+
+# graphtab.py: genders là None hoặc tập con thật sự khác rỗng, đã sắp xếp (canonical_selection)
+def graphtab_states(cube):
+    values = sorted(cube['Gender'].dropna().unique())
+    selections = [None] + [c for n in range(1, len(values)) for c in itertools.combinations(values, n)]
+    for genders in selections:
+        for chart, state in _level_states(cube, genders, ['bar', 'line']):
+            yield chart, state
+            if chart == 'line':
+                for option in charts.CHART_OPTIONS:
+                    yield 'density', dict(state, option=option)
+                    yield 'donut', dict(state, option=option)
+
+
+# stackedbarchart.py: 'All' hoặc một giới tính
+def stacked_states(cube):
+    selections = [None] + [(g,) for g in sorted(cube['Gender'].dropna().unique())]
+    for genders in selections:
+        yield from _level_states(cube, genders, ['stacked_bar', 'stacked_line'])
+
+
+# Job Level và khoảng tuổi mặc định lấy từ slice giới tính, như trên trang
+def _level_states(cube, genders, chart_names):
+    cube_gender = slice_cube(cube, genders=genders)
+    if cube_gender.empty:
+        return
+    age_range = (int(cube_gender['Age'].min()), int(cube_gender['Age'].max()))
+    for level in sorted(cube_gender['Current_Job_Level'].dropna().unique()):
+        for statuses in STATUS_SELECTIONS:
+            state = dict(genders=genders, level=level, age_range=age_range, statuses=statuses)
+            for chart in chart_names:
+                yield chart, state
+
+
+def states(cube):
+    return list(graphtab_states(cube)) + list(stacked_states(cube))
+
+
+# ---- process con ----
+
+_cube = None
+
+
+# Process con không import streamlit: nhận template mặc định (theme "streamlit") của process cha
+def _init(cube, template_name=None, template=None):
+    global _cube
+    _cube = cube
+    if template_name is not None:
+        pio.templates[template_name] = template
+        pio.templates.default = template_name
+
+
+# JSON (đã thu gọn như FigureCache.figure) của figure, hoặc None nếu trang không vẽ biểu đồ
+# này (density / donut không có dữ liệu)
+def _build(task):
+    chart, state = task
+    if chart.startswith('stacked_'):
+        fig = charts.stacked_figure(_cube, chart, **state)
+    else:
+        fig = charts.graphtab_figure(_cube, chart, **state)
+    return None if fig is None else payload.encode(fig).to_json()
+
+
+def build_all(cube, tasks, workers=WORKERS):
+    if workers <= 1 or len(tasks) < 2:
+        _init(cube)
+        return [_build(task) for task in tasks]
+    # spawn: không fork process đang chạy thread của Streamlit
+    context = multiprocessing.get_context('spawn')
+    template_name = pio.templates.default
+    initargs = (cube, template_name, pio.templates[template_name])
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init, initargs=initargs) as pool:
+        return list(pool.map(_build, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+# ---- file .cache/ ----
+
+def _code_hash():
+    digest = hashlib.sha256(plotly.__version__.encode())
+    root = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_FILES:
+        with open(os.path.join(root, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"figures-{digest[:16]}-{_code_hash()}.json")
+
+
+def _tuples(value):
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def load(path, fig_cache):
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        items = json.load(f)
+    for key, fig_json in items:
+        fig_cache.put(_tuples(key), fig_json)
+    return len(items)
+
+
+def save(path, items):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(items, f)
+    os.replace(tmp_path, path)
+
+
+# Dựng các figure còn thiếu trong fig_cache từ cube chính xác của snapshot. File .cache/ chỉ dùng
+# cho dữ liệu chưa nối delta (hash file gốc không đủ để nhận ra dữ liệu đã nối thêm).
+def warm(snapshot, fig_cache, workers=WORKERS):
+    start = time.perf_counter()
+    path = None if snapshot.deltas else cache_path(snapshot.digest)
+    loaded = load(path, fig_cache) if path else 0
+
+    keyed = [(chart_key(chart, **state), (chart, state)) for chart, state in states(snapshot.get('cube'))]
+    missing = [(key, task) for key, task in keyed if key not in fig_cache]
+    # Builder nhận AgePrefix thay cho cube (cùng figure, như trang dùng)
+    results = build_all(snapshot.get('age_prefix'), [task for _, task in missing], workers) if missing else []
+
+    built = [(key, fig_json) for (key, _), fig_json in zip(missing, results) if fig_json is not None]
+    for key, fig_json in built:
+        if key not in fig_cache:  # session đã tự dựng trong lúc chờ
+            fig_cache.put(key, fig_json)
+    if path and built:
+        wanted = {key for key, _ in keyed}
+        save(path, [[key, fig_json] for key, fig_json in fig_cache.items() if key in wanted])
+    if path and os.path.exists(path):
+        remove_stale(path)  # file của dữ liệu hoặc code cũ
+
+    logger.info("Warmed %d figures (%d from %s) in %.1f s", loaded + len(built), loaded, path,
+                time.perf_counter() - start)
+    return len(built)
+
+
+# Làm nóng trong thread nền, trang không phải chờ
+def start(snapshot, fig_cache, workers=WORKERS):
+    def run():
+        try:
+            warm(snapshot, fig_cache, workers)
+        except Exception:  # cache vẫn dùng được, trang tự dựng figure khi cần
+            logger.exception("Could not warm the figure cache")
+    thread = threading.Thread(target=run, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    from data_manager import DataManager
+    from dataset import BUILDERS, DATA_FILE
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    snapshot = DataManager(DATA_FILE, BUILDERS, watch=False).current()
+    fig_cache = FigureCache(maxsize=len(states(snapshot.get('cube'))))
+    built = warm(snapshot, fig_cache, args.workers)
+    print(f"{built} figures built, {len(fig_cache.items())} cached in {cache_path(snapshot.digest)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import base64
+import os
+from dataset import load_data
+from homepage.assets import background_css
 
 # === PAGE CONFIGURATION ===
 st.set_page_config(
@@ -12,19 +11,17 @@ st.set_page_config(
 )
 
 # === BACKGROUND IMAGE SETUP ===
-def get_base64(file_path):
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
+# Ảnh được resize + nén một lần vào static/ và phục vụ qua static file serving
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 img_path = r"D:\VGU\Homepage.png"  # ⚠️ Đảm bảo đường dẫn ảnh đúng
-img_base64 = get_base64(img_path)
+bg_css = background_css(img_path, STATIC_DIR)
 
 # === INJECT BACKGROUND CSS ===
 st.markdown(
     f"""
     <style>
     .stApp {{
-        background-image: url("data:image/png;base64,{img_base64}");
+        {bg_css}
         background-size: cover;
         background-repeat: no-repeat;
         background-attachment: fixed;
@@ -74,10 +71,6 @@ st.markdown(
 st.markdown('<div class="main-title">Education & Career Success</div>', unsafe_allow_html=True)
 
 # === LOAD DATA ===
-@st.cache_data
-def load_data():
-    return pd.read_csv("D:\\VGU\\education_career_success.csv")
-
 df = load_data()
 
 # === TABS ===